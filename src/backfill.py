@@ -0,0 +1,128 @@
+from __future__ import annotations
+import json
+import os
+import re
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+from . import metrics
+from .extract import build_regulations_from_news, load_known_cases
+from .fetch import NewsItem, active_locales, feed_matrix, fetch_news, forget_feeds
+from .history import history_path, record_run
+from .queries import NEWS_QUERIES
+from .search import open_archive
+from .utils import debug_log
+
+# 긴 기간(30~90일 등)의 과거 기사를 날짜 구간 단위로 HISTORY_DB에 채웁니다.
+# - 구간마다 수집 -> 분석 -> 기록(history/trends/본문 색인)을 마치고 결과를 버리므로 메모리는 구간 크기만큼만 사용합니다.
+# - 구간이 끝날 때마다 체크포인트를 남기고, 같은 범위로 다시 실행하면 남은 구간부터 이어갑니다.
+# - GitHub Issue/Slack에는 게시하지 않습니다.
+
+DEFAULT_BACKFILL_STATE = "data/backfill_state.json"
+_WHEN = re.compile(r"\s*\bwhen:\S+")
+
+def date_slices(start: date, end: date, days: int) -> Iterator[Tuple[date, date]]:
+    """[start, end](양 끝 포함)를 days일 단위 (since, until) 구간으로 나눕니다. until은 포함하지 않습니다."""
+    if days < 1:
+        raise ValueError("slice days must be >= 1")
+    last = end + timedelta(days=1)
+    since = start
+    while since < last:
+        until = min(since + timedelta(days=days), last)
+        yield since, until
+        since = until
+
+def windowed_queries(queries: Sequence[str], since: date, until: date) -> List[str]:
+    """
+    Google News 검색 연산자(after:/before:)로 [since, until) 구간을 지정한 쿼리.
+    기존 쿼리의 상대 기간(when:3d 등)은 구간을 최근 며칠로 제한하므로 제거합니다.
+    """
+    after = (since - timedelta(days=1)).isoformat()
+    return [f"{_WHEN.sub('', q).strip()} after:{after} before:{until.isoformat()}" for q in queries]
+
+def _utc(d: date) -> datetime:
+    return datetime(d.year, d.month, d.day, tzinfo=timezone.utc)
+
+def load_state(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        debug_log("Backfill state unreadable, starting over: %s", e)
+        return {}
+
+def save_state(path: str, state: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+def run_backfill(
+    start: date,
+    end: date,
+    *,
+    slice_days: int = 7,
+    state_path: str = DEFAULT_BACKFILL_STATE,
+    history_db: str | None = None,
+    queries: Sequence[str] | None = None,
+    locales: Sequence[str] | None = None,
+    fetch: Callable[[Sequence[str], Sequence[str]], List[NewsItem]] = fetch_news,
+) -> int:
+    """
+    start~end 기간을 구간별로 수집/분석해 HISTORY_DB에 기록합니다. 이번 실행에서 기록한 항목 수를 반환합니다.
+    state_path의 체크포인트가 같은 범위이면 이미 끝난 구간은 건너뜁니다.
+    """
+    if end < start:
+        raise ValueError(f"backfill end {end} is before start {start}")
+    db = history_path() if history_db is None else history_db
+    if not db:
+        raise ValueError("HISTORY_DB가 비어 있어 backfill 결과를 저장할 수 없습니다")
+    queries = list(NEWS_QUERIES if queries is None else queries)
+    locales = list(active_locales() if locales is None else locales)
+
+    state = load_state(state_path)
+    if state.get("start") == start.isoformat() and state.get("end") == end.isoformat():
+        resume = date.fromisoformat(state["next"])
+        if resume > end:
+            debug_log("Backfill %s~%s already complete", start, end)
+        elif resume > start:
+            debug_log("Backfill resuming at %s (%d recorded so far)", resume, state.get("recorded", 0))
+    else:
+        state = {"start": start.isoformat(), "end": end.isoformat(), "next": start.isoformat(), "recorded": 0}
+        resume = start
+
+    known = load_known_cases()
+    archive = open_archive(db)
+    recorded = 0
+    try:
+        for since, until in date_slices(resume, end, slice_days):
+            slice_queries = windowed_queries(queries, since, until)
+            with metrics.span("backfill_slice"):
+                news = fetch(slice_queries, locales)
+                regs = build_regulations_from_news(
+                    news, known, since=_utc(since), until=_utc(until),
+                    page_sink=archive.add if archive else None,
+                )
+                if record_run(regs, db) is None:
+                    # 체크포인트를 넘기지 않으므로 다음 실행에서 이 구간부터 다시 시도
+                    raise RuntimeError(f"history record failed for {since}~{until}")
+                if archive is not None:
+                    archive.flush()
+                forget_feeds(feed_matrix(slice_queries, locales))
+            recorded += len(regs)
+            state["next"] = until.isoformat()
+            state["recorded"] = state.get("recorded", 0) + len(regs)
+            state["updated_at"] = time.time()
+            save_state(state_path, state)
+            metrics.incr("backfill_slices")
+            debug_log("Backfill %s~%s: %d entries, %d regulations", since, until - timedelta(days=1), len(news), len(regs))
+    finally:
+        if archive is not None:
+            archive.close()
+    return recorded
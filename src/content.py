@@ -0,0 +1,186 @@
+from __future__ import annotations
+import json
+import os
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Dict
+
+from . import metrics
+from .utils import debug_log
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+
+# 기사 페이지에서 본문 영역만 추출합니다.
+# - 메뉴/푸터/쿠키 배너/관련 기사 목록 등 boilerplate를 먼저 제거하고,
+# - 문단(<p>) 텍스트 양과 링크 밀도로 본문 루트를 찾아 CSS 선택자로 기억합니다 (도메인별 site profile).
+# - 같은 도메인의 다음 페이지는 학습 없이 저장된 선택자로 바로 본문을 꺼냅니다.
+
+DEFAULT_SITE_PROFILES = "data/site_profiles.json"
+# 본문 루트로 인정할 최소 텍스트 길이. 이보다 짧으면 프로필을 다시 학습합니다.
+MIN_ROOT_CHARS = 200
+MIN_PARAGRAPH_CHARS = 40
+
+_REMOVE_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "nav", "aside", "footer", "form", "button"}
+# class/id를 공백·-·_ 로 나눈 토큰이 이 중 하나와 정확히 같을 때만 boilerplate로 봅니다.
+# (부분 문자열로 비교하면 "commentary", "main-content" 같은 본문 래퍼까지 지워집니다.)
+_BOILERPLATE_TOKENS = frozenset({
+    "cookie", "cookies", "consent", "banner", "subscribe", "newsletter", "related", "share", "social",
+    "comment", "comments", "promo", "advert", "advertisement", "ads", "sidebar", "popup", "breadcrumb",
+    "breadcrumbs", "footer", "menu",
+})
+_TOKEN_SPLIT = re.compile(r"[\s_-]+")
+# 페이지 문단 텍스트의 이 비율 이상을 담은 요소는 boilerplate 토큰이 있어도 지우지 않습니다 (예: "layout has-sidebar").
+MAX_REMOVED_SHARE = 0.5
+_KEEP_TAGS = {"html", "body", "main", "article"}
+_CSS_IDENT = re.compile(r"^[A-Za-z_][\w-]*$")
+
+_profiles: Dict[str, dict] | None = None
+_dirty = False
+_lock = threading.Lock()
+
+def _profiles_path() -> str:
+    return os.environ.get("SITE_PROFILES", DEFAULT_SITE_PROFILES)
+
+def _load() -> Dict[str, dict]:
+    global _profiles
+    if _profiles is None:
+        _profiles = {}
+        path = _profiles_path()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    _profiles = json.load(f)
+            except Exception as e:
+                debug_log("Site profiles unreadable, relearning: %s", e)
+    return _profiles
+
+def save_profiles() -> None:
+    """학습한 프로필을 기존 파일 내용과 합쳐 원자적으로 기록합니다 (여러 워커가 써도 유실 최소화)."""
+    global _dirty
+    path = _profiles_path()
+    if not path or not _dirty or _profiles is None:
+        return
+    with _lock:
+        merged: Dict[str, dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    merged = json.load(f)
+            except Exception:
+                merged = {}
+        merged.update(_profiles)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(merged, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp, path)
+        _dirty = False
+
+def reset_profiles() -> None:
+    """메모리의 프로필을 버리고 다음 호출에서 SITE_PROFILES를 다시 읽습니다 (벤치마크/테스트용)."""
+    global _profiles, _dirty
+    _profiles = None
+    _dirty = False
+
+def _is_boilerplate(tag: "Tag") -> bool:
+    hint = " ".join(tag.get("class") or ()) + " " + (tag.get("id") or "")
+    return any(token in _BOILERPLATE_TOKENS for token in _TOKEN_SPLIT.split(hint.lower()))
+
+def _paragraph_chars(node: "Tag") -> int:
+    return sum(len(p.get_text(" ", strip=True)) for p in node.find_all("p"))
+
+def _strip_boilerplate(root: "Tag") -> None:
+    """root 아래의 boilerplate 요소를 한 번의 순회로 제거합니다."""
+    total = _paragraph_chars(root)
+    for tag in root.find_all(True):
+        if tag.decomposed:
+            continue
+        name = tag.name
+        if name in _REMOVE_TAGS:
+            tag.decompose()
+            continue
+        if name in _KEEP_TAGS:
+            continue
+        if _is_boilerplate(tag):
+            # 본문 대부분을 감싼 레이아웃 래퍼는 남기고, 그 안의 요소를 계속 검사
+            if total and _paragraph_chars(tag) >= total * MAX_REMOVED_SHARE:
+                metrics.incr("boilerplate_wrappers_kept")
+                continue
+            tag.decompose()
+        elif name == "header" and tag.find_parent(("article", "main")) is None:
+            # 기사 안의 <header>(제목/부제)는 남기고 사이트 헤더만 제거
+            tag.decompose()
+
+def _learn_root(soup: "BeautifulSoup") -> "Tag | None":
+    """문단 텍스트를 부모(1.0)/조부모(0.5)에 누적하고 링크 밀도로 보정해 본문 루트를 고릅니다."""
+    scores: Dict[int, list] = {}
+    for p in soup.find_all("p"):
+        n = len(p.get_text(" ", strip=True))
+        if n < MIN_PARAGRAPH_CHARS:
+            continue
+        for node, weight in ((p.parent, 1.0), (p.parent.parent if p.parent else None, 0.5)):
+            if node is None or node.name in ("html", "[document]"):
+                continue
+            entry = scores.setdefault(id(node), [node, 0.0])
+            entry[1] += n * weight
+    best, best_score = None, 0.0
+    for node, score in scores.values():
+        text_len = len(node.get_text(" ", strip=True)) or 1
+        link_len = sum(len(a.get_text(" ", strip=True)) for a in node.find_all("a"))
+        score *= 1.0 - min(1.0, link_len / text_len)
+        if score > best_score:
+            best, best_score = node, score
+    return best
+
+def _selector_for(node: "Tag", soup: "BeautifulSoup") -> str | None:
+    """같은 문서에서 node 하나만 가리키는 간단한 CSS 선택자. 만들 수 없으면 None."""
+    node_id = node.get("id")
+    if node_id and _CSS_IDENT.match(node_id):
+        return f"#{node_id}"
+    classes = [c for c in (node.get("class") or []) if _CSS_IDENT.match(c)]
+    for sel in ([f"{node.name}.{classes[0]}"] if classes else []) + [node.name]:
+        if len(soup.select(sel, limit=2)) == 1:
+            return sel
+    return None
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[ \t]+", " ", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+def extract_main_text(soup: "BeautifulSoup", domain: str) -> str:
+    """soup에서 본문 텍스트를 추출합니다. soup은 수정됩니다."""
+    global _dirty
+    profiles = _load()
+    profile = profiles.get(domain)
+    if profile:
+        # 저장된 본문 루트 안쪽만 정리하면 되므로 문서 전체를 순회하지 않습니다.
+        node = soup.select_one(profile["selector"])
+        if node is not None:
+            _strip_boilerplate(node)
+            text = _normalize(node.get_text("\n"))
+            if len(text) >= MIN_ROOT_CHARS:
+                metrics.incr("site_profile_hits")
+                return text
+        metrics.incr("site_profile_misses")
+
+    _strip_boilerplate(soup)
+    node = _learn_root(soup)
+    if node is None:
+        body = soup.body or soup
+        return _normalize(body.get_text("\n"))
+    text = _normalize(node.get_text("\n"))
+    if len(text) < MIN_ROOT_CHARS:
+        body = soup.body or soup
+        return _normalize(body.get_text("\n"))
+    selector = _selector_for(node, soup)
+    if selector:
+        with _lock:
+            profiles[domain] = {"selector": selector, "learned_at": int(time.time())}
+            _dirty = True
+        metrics.incr("site_profiles_learned")
+        debug_log("Site profile learned: %s -> %s", domain, selector)
+    return text
@@ -0,0 +1,140 @@
+from __future__ import annotations
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, TYPE_CHECKING
+
+from .fetch import NewsItem, active_locales, feed_matrix, fetch_query, _sort_key
+from .extract import load_known_cases, build_regulations_from_news
+from .history import record_run
+from .search import open_archive
+from .queries import NEWS_QUERIES
+from . import content, hosthealth, metrics
+from .utils import canonical_url, debug_log
+
+if TYPE_CHECKING:
+    from .run import Settings
+
+@dataclass
+class QuerySchedule:
+    """쿼리(에디션)별 폴링 상태. 피드가 자주 바뀔수록 interval이 짧아집니다."""
+    query: str
+    interval: float
+    locale: str = "en-US"
+    next_at: float = 0.0
+    seen: set[str] = field(default_factory=set)
+    # 마지막 폴링에서 본 URL. 게시가 끝난 뒤 commit_seen으로 seen에 반영합니다.
+    latest: set[str] = field(default_factory=set)
+    polls: int = 0
+    changes: int = 0
+
+def adapt_interval(interval: float, changed: bool, min_interval: float, max_interval: float) -> float:
+    """새 항목이 있으면 주기를 절반으로, 없으면 1.5배로 (min~max 범위 안에서) 조정합니다."""
+    if changed:
+        interval = interval / 2
+    else:
+        interval = interval * 1.5
+    return max(min_interval, min(max_interval, interval))
+
+def poll_query(schedule: QuerySchedule) -> List[NewsItem]:
+    """
+    쿼리를 한 번 폴링하여 마지막으로 게시한 폴링 이후 처음 보는 항목만 반환합니다.
+    seen은 바로 바꾸지 않으므로, 게시가 실패하면 다음 폴링에서 같은 항목이 다시 새 항목으로 나옵니다.
+    """
+    items = fetch_query(schedule.query, schedule.locale)
+    schedule.latest = {canonical_url(it.url) for it in items}
+    new_items = [it for it in items if canonical_url(it.url) not in schedule.seen]
+    schedule.polls += 1
+    if new_items:
+        schedule.changes += 1
+    return new_items
+
+def commit_seen(schedule: QuerySchedule) -> None:
+    # 피드에서 빠진 URL은 잊어버려 seen 크기가 피드 크기로 제한되도록 합니다.
+    schedule.seen = schedule.latest
+
+def run_daemon(
+    settings: "Settings",
+    *,
+    metrics_dir: str = "",
+    max_cycles: int | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> None:
+    """
+    상주 모드 메인 루프.
+    HTTP 세션/피드/기사 캐시를 프로세스 안에서 유지하고, 새 항목이 생긴 경우에만 GitHub/Slack에 게시합니다.
+    """
+    from .run import publish
+
+    min_interval = float(os.environ.get("DAEMON_MIN_INTERVAL", "300"))
+    max_interval = float(os.environ.get("DAEMON_MAX_INTERVAL", "3600"))
+    initial = float(os.environ.get("DAEMON_INITIAL_INTERVAL", "900"))
+    initial = max(min_interval, min(max_interval, initial))
+
+    schedules = [
+        QuerySchedule(query=q, interval=initial, locale=locale)
+        for q, locale in feed_matrix(NEWS_QUERIES, active_locales()).values()
+    ]
+    known = load_known_cases()
+    archive = open_archive()
+    cycles = 0
+    debug_log("Daemon started: %d feeds, interval %.0f~%.0fs", len(schedules), min_interval, max_interval)
+
+    while max_cycles is None or cycles < max_cycles:
+        now = clock()
+        due = [s for s in schedules if s.next_at <= now]
+        fresh: Dict[str, NewsItem] = {}
+        polled: List[QuerySchedule] = []
+        for s in due:
+            try:
+                with metrics.span("fetch"):
+                    new_items = poll_query(s)
+                polled.append(s)
+            except Exception as e:
+                debug_log("Daemon poll failed: %s [%s], error: %s", s.query, s.locale, e)
+                new_items = []
+            s.interval = adapt_interval(s.interval, bool(new_items), min_interval, max_interval)
+            s.next_at = clock() + s.interval
+            debug_log("Polled '%s' [%s]: %d new, next in %.0fs", s.query, s.locale, len(new_items), s.interval)
+            for it in new_items:
+                # 여러 에디션에서 동시에 새로 나온 기사는 한 번만 처리
+                fresh.setdefault(canonical_url(it.url), it)
+
+        published = True
+        if fresh:
+            news = sorted(fresh.values(), key=_sort_key, reverse=True)
+            try:
+                with metrics.span("extract"):
+                    regulations = build_regulations_from_news(
+                        news, known, lookback_days=settings.lookback_days, page_sink=archive.add if archive else None
+                    )
+                if regulations:
+                    with metrics.span("history"):
+                        record_run(regulations)
+                        if archive is not None:
+                            archive.flush()
+                    publish(settings, regulations)
+                else:
+                    debug_log("Daemon: %d new entries, none relevant. Skip publish.", len(news))
+            except Exception as e:
+                # seen을 갱신하지 않아 이 항목들은 해당 쿼리의 다음 폴링에서 다시 처리됩니다.
+                published = False
+                metrics.incr("daemon_publish_errors")
+                debug_log("Daemon publish failed, %d entries will be retried: %s", len(news), e)
+        if published:
+            for s in polled:
+                commit_seen(s)
+
+        hosthealth.save()
+        content.save_profiles()
+        if metrics_dir:
+            # 데몬에서는 카운터가 프로세스 수명 동안 누적됩니다 (Prometheus counter 의미와 동일).
+            metrics.export(metrics_dir)
+
+        cycles += 1
+        if max_cycles is not None and cycles >= max_cycles:
+            break
+        wait = min(s.next_at for s in schedules) - clock()
+        if wait > 0:
+            sleep(wait)
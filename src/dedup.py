@@ -1,7 +1,8 @@
 from __future__ import annotations
 import re
 from typing import List, Set, Tuple
-from .utils import debug_log
+from . import metrics
+from .utils import canonical_url, debug_log
 
 def extract_section(md_text: str, section_title: str) -> str:
     """Markdown 텍스트에서 특정 섹션 제목 아래의 내용을 추출합니다."""
@@ -42,7 +43,7 @@ def parse_table(section_md: str) -> Tuple[List[str], List[List[str]], Tuple[str,
         if len(cols) == len(header_cols):
             parsed_rows.append(cols)
         else:
-            debug_log(f"Table row column mismatch: expected {len(header_cols)}, got {len(cols)}. Row: {row[:100]}...")
+            debug_log("Table row column mismatch: expected %d, got %d. Row: %s...", len(header_cols), len(cols), row[:100])
 
     return header_cols, parsed_rows, (header, separator)
 
@@ -53,17 +54,9 @@ def extract_article_url(cell: str) -> str | None:
         return m.group(1).split("&hl=")[0]
     return None
 
-def apply_deduplication(md: str, comments: List[dict]) -> Tuple[str, dict | None]:
-    """
-    이전 GitHub 댓글들을 분석하여 중복된 데이터를 'skip' 처리하고 요약을 추가합니다.
-    """
-    if not comments:
-        return md, None
-
-    # 1) Base Snapshot Key Set 생성 (모든 이전 댓글 대상)
+def baseline_urls(comments: List[dict]) -> Set[str]:
+    """이전 GitHub 댓글들의 뉴스 테이블에서 기사 URL을 정규화 URL로 모읍니다 (게시 URL 색인과 같은 형식)."""
     base_article_set: Set[str] = set()
-    base_docket_set: Set[str] = set()
-
     for comment in comments:
         body = comment.get("body") or ""
         
@@ -75,7 +68,18 @@ def apply_deduplication(md: str, comments: List[dict]) -> Tuple[str, dict | None
             for r in r_news:
                 url = extract_article_url(r[idx])
                 if url:
-                    base_article_set.add(url)
+                    base_article_set.add(canonical_url(url))
+    return base_article_set
+
+def apply_deduplication(md: str, comments: List[dict], base_urls: Set[str] | None = None) -> Tuple[str, dict | None]:
+    """
+    이전 게시 내용과 중복된 데이터를 'skip' 처리하고 요약을 추가합니다.
+    base_urls(기록 저장소의 게시 URL 색인, 정규화 URL)가 주어지면 댓글을 파싱하지 않고 그것을 기준으로 비교합니다.
+    """
+    # 1) Base Snapshot Key Set 생성 (두 경로 모두 정규화 URL)
+    base_article_set = base_urls if base_urls is not None else baseline_urls(comments)
+    if not base_article_set and not comments:
+        return md, None
 
     # 2) 현재 Markdown 처리 (News)
     current_md = md
@@ -95,8 +99,8 @@ def apply_deduplication(md: str, comments: List[dict]) -> Tuple[str, dict | None
 
         for r in n_rows:
             url = extract_article_url(r[title_idx])
-            if url in base_article_set:
-                debug_log(f"Skipping duplicate News: {r[title_idx]} ({url})")
+            if url and canonical_url(url) in base_article_set:
+                debug_log("Skipping duplicate News: %s (%s)", r[title_idx], url)
             else:
                 non_skip_rows.append(r)
                 new_article_count += 1
@@ -130,6 +134,9 @@ def apply_deduplication(md: str, comments: List[dict]) -> Tuple[str, dict | None
         f"{new_label}\n\n"
     )
 
+    metrics.incr("deduped", dup_news_count)
+    metrics.incr("new_items", new_article_count)
+
     stats = {
         "base_news": base_news_count,
         "dup_news": dup_news_count,
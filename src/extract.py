@@ -1,12 +1,19 @@
 from __future__ import annotations
 import re
-import requests
-import yaml
-from bs4 import BeautifulSoup
+import time
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from .utils import debug_log
+from urllib.parse import urlsplit
+from . import hosthealth, metrics
+from .content import extract_main_text
+from .utils import debug_log, get_session
+
+# 기사 URL -> (텍스트, 최종URL). 데몬 모드에서 같은 기사를 다시 받지 않도록 유지합니다.
+_PAGE_CACHE: "OrderedDict[str, tuple[str, str]]" = OrderedDict()
+_PAGE_CACHE_MAX = 512
 
 @dataclass
 class RegulationInfo:
@@ -22,24 +29,69 @@ class RegulationInfo:
     matched_keywords: str = ""
 
 
-def fetch_page_text(url: str, timeout: int = 15) -> tuple[str, str]:
-    """기사 페이지 텍스트를 가져오고 (텍스트, 최종URL)을 반환한다."""
+# 본문이 이보다 짧으면 페이월/봇 차단 안내문으로 보고 호스트 실패로 기록합니다.
+STUB_MIN_CHARS = 200
+
+def fetch_page_text(url: str, timeout: float | None = None, host: str = "") -> tuple[str, str]:
+    """
+    기사 페이지 텍스트를 가져오고 (텍스트, 최종URL)을 반환한다.
+    host(기본: URL의 호스트)별 상태에 따라 타임아웃을 정하고, 회로가 열린 호스트는 요청하지 않고 빈 텍스트를 반환한다.
+    """
+    cached = _PAGE_CACHE.get(url)
+    if cached is not None:
+        _PAGE_CACHE.move_to_end(url)
+        metrics.incr("page_cache_hits")
+        return cached
+    host = host or urlsplit(url).netloc.lower()
+    health = hosthealth.get()
+    if health is not None and not health.allow(host):
+        metrics.incr("circuit_skips")
+        debug_log("Circuit open, skip page fetch: %s", host)
+        return "", url
+    if timeout is None:
+        timeout = health.timeout(host) if health is not None else 15
+    t0 = time.perf_counter()
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"}, allow_redirects=True)
+        r = get_session().get(url, timeout=timeout, allow_redirects=True)
         r.raise_for_status()
+        metrics.incr("pages_fetched")
+        metrics.incr("page_bytes", len(r.content))
         final_url = (r.url or url).strip()
+        from bs4 import BeautifulSoup
         soup = BeautifulSoup(r.text, "lxml")
-        for tag in soup(["script", "style", "noscript"]):
-            tag.decompose()
-        text = soup.get_text("\n")
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        return text[:20000], final_url
+        # 메뉴/푸터/배너 등을 뺀 본문만 (도메인별 본문 선택자를 학습해 재사용)
+        domain = urlsplit(final_url).netloc.lower().removeprefix("www.")
+        text = extract_main_text(soup, domain)
+        metrics.incr("text_chars", len(text))
+        result = (text[:20000], final_url)
+        if health is not None:
+            health.record(host, time.perf_counter() - t0, ok=len(text.strip()) >= STUB_MIN_CHARS)
+        _PAGE_CACHE[url] = result
+        if len(_PAGE_CACHE) > _PAGE_CACHE_MAX:
+            _PAGE_CACHE.popitem(last=False)
+        return result
     except Exception as e:
-        debug_log(f"fetch_page_text failed: {url}, error: {e}")
+        metrics.incr("page_errors")
+        if health is not None:
+            health.record(host, time.perf_counter() - t0, ok=False)
+        debug_log("fetch_page_text failed: %s, error: %s", url, e)
         return "", url
 
+def fetch_article_text(item) -> tuple[str, str, bool]:
+    """
+    NewsItem의 본문을 가져온다. 언론사 호스트는 RSS <source url>을 우선 사용한다.
+    본문을 얻지 못하면(실패/회로 열림) RSS 제목과 요약으로 대신한다.
+    (텍스트, 최종 URL, RSS 대체 여부)를 반환한다. 대체 텍스트는 분석에만 쓰고 본문으로 보관하지 않는다.
+    """
+    host = urlsplit(item.source_url).netloc.lower() if item.source_url else ""
+    text, final_url = fetch_page_text(item.url, host=host)
+    if not text and (item.summary or item.title):
+        metrics.incr("rss_fallbacks")
+        return f"{item.title}\n{item.summary}".strip(), final_url, True
+    return text, final_url, False
+
 def load_known_cases(path: str = "data/known_cases.yml") -> List[Dict[str, Any]]:
+    import yaml
     try:
         with open(path, "r", encoding="utf-8") as f:
             return yaml.safe_load(f) or []
@@ -54,10 +106,9 @@ def enrich_from_known(text: str, title: str, known: List[Dict[str, Any]]) -> Dic
             return entry.get("enrich", {}) or {}
     return {}
 
-def extract_country(text: str, title: str) -> str:
-    """본문 또는 제목에서 국가 정보를 추정한다."""
-    text_to_search = (title + " " + text).lower()
-    
+@lru_cache(maxsize=None)
+def _country_table() -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """국가 -> 키워드 매핑. 첫 호출 시 한 번만 생성합니다."""
     mapping = {
         "Ascension and Tristan da Cunha": ["Ascension and Tristan da Cunha", "saint helena"],
         "EU": ["eu ", "european union", "유럽연합", "브뤼셀", "유럽"],
@@ -304,12 +355,16 @@ def extract_country(text: str, title: str) -> str:
         "헝가리": ["hungary", "헝가리"],
         "홍콩": ["hong kong", "홍콩"]
     }
+    return tuple((country, tuple(keywords)) for country, keywords in mapping.items())
 
-    
-    for country, keywords in mapping.items():
+def extract_country(text: str, title: str) -> str:
+    """본문 또는 제목에서 국가 정보를 추정한다."""
+    text_to_search = (title + " " + text).lower()
+
+    for country, keywords in _country_table():
         if any(k in text_to_search for k in keywords):
             return country
-            
+
     return "기타"
 
 def extract_regulation_subject(text: str, title: str) -> str:
@@ -337,55 +392,48 @@ def reason_heuristic(hay: str) -> str:
         return "EU AI Act 또는 이에 준하는 고강도 AI 규제 법안의 진척 및 대응 필요 사항."
     return "국내외 AI 규제 법제화, 가이드라인 배포 및 정책 동향 관련 최신 정보."
 
-def build_regulations_from_news(news_items, known_cases, lookback_days: int = 3) -> List[RegulationInfo]:
-    results: List[RegulationInfo] = []
-    debug_log(f"build_regulations_from_news items={len(news_items)} lookback={lookback_days}")
-    cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
-    for item in news_items:
-        if item.published_at and item.published_at < cutoff:
-            continue
-        text, final_url = fetch_page_text(item.url)
-        if not text:
-            continue
+# 규제 관련성 판단 키워드 (모두 소문자)
+RELEVANCE_KEYWORDS = (
+    "regulation", "governance", "act", "policy", "bill", "copyright", "dispute", "legal",
+    "intellectual property", "framework", "safety summit", "guideline", "ethics",
+    "규제", "거버넌스", "기본법", "정책", "가이드라인", "저작권", "책임법", "윤리", "지식재산권",
+)
 
-        hay = (item.title + " " + text)
-        lower = hay.lower()
-        keywords = [
-            "regulation", "governance", "act", "policy", "bill", "copyright", "dispute", "legal", 
-            "intellectual property", "framework", "safety summit", "guideline", "ethics",
-            "규제", "거버넌스", "기본법", "정책", "가이드라인", "저작권", "책임법", "윤리", "지식재산권"
-        ]
-        found = [k for k in keywords if k.lower() in lower]
-        if not found:
-            debug_log(f"Skipped non-relevant news: {item.title[:60]}...")
-            continue
-        matched_str = ", ".join(found)
+def analyze_item(item, text: str, final_url: str, known_cases) -> RegulationInfo | None:
+    """기사 텍스트로 규제 관련성을 판단하고 RegulationInfo를 만든다. 관련 없으면 None."""
+    hay = (item.title + " " + text)
+    lower = hay.lower()
+    found = [k for k in RELEVANCE_KEYWORDS if k in lower]
+    if not found:
+        metrics.incr("filtered")
+        debug_log("Skipped non-relevant news: %s...", item.title[:60])
+        return None
+    matched_str = ", ".join(found)
 
-        enrich = enrich_from_known(text, item.title, known_cases)
+    enrich = enrich_from_known(text, item.title, known_cases)
 
-        # 규제명/대상 추출
-        article_title = item.title
-        country = enrich.get("country") or extract_country(text, article_title)
-        case_title = enrich.get("case_title") or extract_regulation_subject(text, article_title)
-        case_number = enrich.get("case_number") or "N/A"
+    # 규제명/대상 추출
+    article_title = item.title
+    country = enrich.get("country") or extract_country(text, article_title)
+    case_title = enrich.get("case_title") or extract_regulation_subject(text, article_title)
+    case_number = enrich.get("case_number") or "N/A"
 
-        published = item.published_at or datetime.now(timezone.utc)
-        update_date = published.date().isoformat()
+    published = item.published_at or datetime.now(timezone.utc)
+    update_date = published.date().isoformat()
 
-        results.append(
-            RegulationInfo(
-                update_or_filed_date=update_date,
-                country=country,
-                case_title=case_title,
-                article_title=article_title,
-                case_number=case_number,
-                reason=enrich.get("reason", reason_heuristic(hay)),
-                article_urls=sorted(list({final_url, item.url})),
-                matched_keywords=matched_str
-            )
-        )
+    return RegulationInfo(
+        update_or_filed_date=update_date,
+        country=country,
+        case_title=case_title,
+        article_title=article_title,
+        case_number=case_number,
+        reason=enrich.get("reason", reason_heuristic(hay)),
+        article_urls=sorted(list({final_url, item.url})),
+        matched_keywords=matched_str
+    )
 
-    # 병합
+def merge_regulations(results: List[RegulationInfo]) -> List[RegulationInfo]:
+    """(사건번호, 국가, 규제명, 기사 제목)이 같은 항목을 하나로 병합한다."""
     merged: Dict[tuple[str, str, str, str], RegulationInfo] = {}
     for r in results:
         key = (r.case_number, r.country, r.case_title, r.article_title)
@@ -400,4 +448,41 @@ def build_regulations_from_news(news_items, known_cases, lookback_days: int = 3)
             k2 = [x.strip() for x in r.matched_keywords.split(",") if x.strip()]
             merged[key].matched_keywords = ", ".join(sorted(list(set(k1 + k2))))
 
-    return list(merged.values())
\ No newline at end of file
+    metrics.incr("merged", len(results) - len(merged))
+    metrics.incr("regulations", len(merged))
+    return list(merged.values())
+
+def build_regulations_from_news(
+    news_items,
+    known_cases,
+    lookback_days: int = 3,
+    page_sink: Callable[[RegulationInfo, str], None] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> List[RegulationInfo]:
+    """
+    기간 안의 기사 본문을 가져와 분석하고 병합합니다.
+    since/until이 주어지면 lookback_days 대신 [since, until) 구간을 사용합니다 (until이 있으면 게시 시각 없는 기사는 제외).
+    page_sink가 주어지면 관련 기사마다 (RegulationInfo, 본문 텍스트)로 호출합니다 (본문 보관 등).
+    """
+    results: List[RegulationInfo] = []
+    debug_log("build_regulations_from_news items=%d lookback=%d", len(news_items), lookback_days)
+    cutoff = since or datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    for item in news_items:
+        if item.published_at and item.published_at < cutoff:
+            continue
+        if until is not None and (item.published_at is None or item.published_at >= until):
+            continue
+        metrics.incr("in_window")
+        text, final_url, fallback = fetch_article_text(item)
+        if not text:
+            continue
+        info = analyze_item(item, text, final_url, known_cases)
+        if info is not None:
+            results.append(info)
+            # RSS 요약을 본문으로 보관하면 INSERT OR IGNORE 때문에 나중에 받은 실제 본문이 보관되지 않음
+            if page_sink is not None and not fallback:
+                page_sink(info, text)
+
+    # 병합
+    return merge_regulations(results)
@@ -1,13 +1,27 @@
 from __future__ import annotations
-import feedparser
+import html
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, Iterable, List, Sequence, Tuple
 from datetime import datetime, timezone
-from dateutil import parser as dtparser
-from .queries import NEWS_QUERIES
-from .utils import debug_log
+from .queries import DEFAULT_LOCALES, NEWS_LOCALES, NEWS_QUERIES
+from . import metrics
+from .utils import canonical_url, debug_log, get_session
 
-GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q={q}&hl=en-US&gl=US&ceid=US:en"
+# NEWS_RSS_URL로 피드 주소 템플릿을 바꿀 수 있습니다 (로컬 벤치마크 서버 등).
+# {hl}/{gl}/{ceid}가 없는 템플릿이면 모든 에디션이 같은 URL이 되어 한 번만 요청됩니다.
+GOOGLE_NEWS_RSS = os.environ.get("NEWS_RSS_URL", "https://news.google.com/rss/search?q={q}&hl={hl}&gl={gl}&ceid={ceid}")
+
+# 피드 URL -> (ETag, Last-Modified, 마지막으로 파싱한 항목들)
+# 조건부 요청(304)일 때 이전 결과를 그대로 재사용합니다.
+_FEED_CACHE: Dict[str, Tuple[str, str, List["NewsItem"]]] = {}
+
+# 진행 중인 피드 요청. 같은 URL을 동시에 요청하면 먼저 시작한 요청의 결과를 함께 사용합니다.
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
 
 @dataclass
 class NewsItem:
@@ -15,10 +29,15 @@ class NewsItem:
     url: str
     published_at: datetime | None
     source: str
+    locale: str = ""
+    # RSS description(HTML 제거)과 <source url="..."> (언론사 호스트 판별용)
+    summary: str = ""
+    source_url: str = ""
 
 def _parse_dt(s: str | None) -> datetime | None:
     if not s:
         return None
+    from dateutil import parser as dtparser
     try:
         dt = dtparser.parse(s)
         if not dt.tzinfo:
@@ -27,27 +46,146 @@ def _parse_dt(s: str | None) -> datetime | None:
     except Exception:
         return None
 
-def fetch_news() -> List[NewsItem]:
+def _strip_html(s: str) -> str:
+    return html.unescape(re.sub(r"<[^>]+>", " ", s)).replace("\xa0", " ").strip()
+
+def _sort_key(item: NewsItem) -> datetime:
+    return item.published_at or datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def active_locales() -> List[str]:
+    """NEWS_LOCALES 환경 변수(쉼표 구분)에서 사용할 에디션 목록을 읽습니다. 알 수 없는 값은 건너뜁니다."""
+    raw = os.environ.get("NEWS_LOCALES", "")
+    locales = [x.strip() for x in raw.split(",") if x.strip()] or list(DEFAULT_LOCALES)
+    unknown = [x for x in locales if x not in NEWS_LOCALES]
+    if unknown:
+        debug_log("Unknown NEWS_LOCALES ignored: %s", unknown)
+    return [x for x in locales if x in NEWS_LOCALES] or list(DEFAULT_LOCALES)
+
+def feed_url(q: str, locale: str = "en-US") -> str:
+    hl, gl, ceid = NEWS_LOCALES[locale]
+    return GOOGLE_NEWS_RSS.format(q=q.replace(" ", "%20"), hl=hl, gl=gl, ceid=ceid)
+
+def _fetch_feed(url: str, label: str, locale: str) -> List[NewsItem]:
+    etag, modified, cached = _FEED_CACHE.get(url, ("", "", []))
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+    try:
+        r = get_session().get(url, headers=headers, timeout=20)
+        if r.status_code == 304:
+            metrics.incr("feeds_not_modified")
+            debug_log("Feed not modified (cached %d entries): %s", len(cached), label)
+            return cached
+        r.raise_for_status()
+    except Exception as e:
+        metrics.incr("feed_errors")
+        debug_log("fetch_query failed: %s, error: %s", label, e)
+        return cached
+
+    import feedparser
+    feed = feedparser.parse(r.content)
+    metrics.incr("feeds_fetched")
+    metrics.incr("feed_bytes", len(r.content))
+    metrics.incr("entries_seen", len(feed.entries))
+    debug_log("Found %d entries for query: %s", len(feed.entries), label)
+
     items: List[NewsItem] = []
-    seen: set[str] = set()
+    for e in feed.entries:
+        title = getattr(e, "title", "").strip()
+        link = getattr(e, "link", "").strip()
+        if not link:
+            continue
+        published = _parse_dt(getattr(e, "published", None))
+        source = source_url = ""
+        if hasattr(e, "source") and e.source:
+            source = e.source.get("title", "") or ""
+            source_url = e.source.get("href", "") or ""
+        items.append(NewsItem(
+            title=title, url=link, published_at=published, source=source, locale=locale,
+            summary=_strip_html(getattr(e, "summary", "") or ""), source_url=source_url,
+        ))
 
-    for q in NEWS_QUERIES:
-        debug_log(f"Fetching news for query: {q}")
-        feed_url = GOOGLE_NEWS_RSS.format(q=q.replace(" ", "%20"))
-        feed = feedparser.parse(feed_url)
-        debug_log(f"Found {len(feed.entries)} entries for query: {q}")
-
-        for e in feed.entries:
-            title = getattr(e, "title", "").strip()
-            link = getattr(e, "link", "").strip()
-            published = _parse_dt(getattr(e, "published", None))
-            source = ""
-            if hasattr(e, "source") and e.source:
-                source = getattr(e.source, "title", "") or ""
-            if not link or link in seen:
+    _FEED_CACHE[url] = (r.headers.get("ETag", ""), r.headers.get("Last-Modified", ""), items)
+    return items
+
+def fetch_feed(url: str, label: str = "", locale: str = "") -> List[NewsItem]:
+    """
+    피드 URL 하나를 가져옵니다. 같은 URL 요청이 이미 진행 중이면 새로 요청하지 않고 그 결과를 기다립니다.
+    피드가 바뀌지 않았다면(304) 캐시된 항목을 반환합니다.
+    """
+    with _INFLIGHT_LOCK:
+        pending = _INFLIGHT.get(url)
+        if pending is None:
+            pending = _INFLIGHT[url] = Future()
+            owner = True
+        else:
+            owner = False
+    if not owner:
+        metrics.incr("feeds_coalesced")
+        return list(pending.result())
+
+    try:
+        items = _fetch_feed(url, label or url, locale)
+        pending.set_result(items)
+    except BaseException as e:
+        pending.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(url, None)
+    return list(items)
+
+def forget_feeds(urls: Iterable[str]) -> None:
+    """피드 캐시(ETag/항목)에서 지웁니다. 다시 요청하지 않을 피드(기간 지정 backfill 등)가 메모리에 쌓이지 않게 합니다."""
+    for url in urls:
+        _FEED_CACHE.pop(url, None)
+
+def fetch_query(q: str, locale: str = "en-US") -> List[NewsItem]:
+    """단일 쿼리의 RSS 피드를 지정한 에디션으로 가져옵니다."""
+    debug_log("Fetching news for query: %s [%s]", q, locale)
+    return fetch_feed(feed_url(q, locale), f"{q} [{locale}]", locale)
+
+def feed_matrix(queries: Sequence[str], locales: Sequence[str]) -> Dict[str, Tuple[str, str]]:
+    """쿼리 x 에디션 조합을 피드 URL 기준으로 묶습니다. {url: (query, locale)} (처음 나온 조합 유지)"""
+    urls: Dict[str, Tuple[str, str]] = {}
+    for q in queries:
+        for locale in locales:
+            urls.setdefault(feed_url(q, locale), (q, locale))
+    return urls
+
+def fetch_news(queries: Sequence[str] | None = None, locales: Sequence[str] | None = None) -> List[NewsItem]:
+    """
+    쿼리 x 에디션 피드를 병렬(FEED_CONCURRENCY, 기본 4)로 가져오고,
+    여러 에디션/쿼리에 함께 나온 기사는 정규화 URL 기준으로 한 번만 남깁니다.
+    """
+    queries = list(NEWS_QUERIES if queries is None else queries)
+    locales = list(active_locales() if locales is None else locales)
+    urls = feed_matrix(queries, locales)
+    metrics.incr("feeds_coalesced", len(queries) * len(locales) - len(urls))
+
+    workers = max(1, min(int(os.environ.get("FEED_CONCURRENCY", "4")), len(urls)))
+    if workers == 1:
+        # 스레드 없이 순차 수집 (--profile에서 피드 단계 함수별 비용을 보려면 FEED_CONCURRENCY=1)
+        results = [fetch_query(q, locale) for q, locale in urls.values()]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fetch_query, q, locale) for q, locale in urls.values()]
+            results = [f.result() for f in futures]
+
+    items: List[NewsItem] = []
+    seen: set[str] = set()
+    for feed_items in results:
+        for item in feed_items:
+            key = canonical_url(item.url)
+            if key in seen:
+                metrics.incr("duplicate_entries")
                 continue
-            seen.add(link)
-            items.append(NewsItem(title=title, url=link, published_at=published, source=source))
+            seen.add(key)
+            items.append(item)
 
-    items.sort(key=lambda x: x.published_at or datetime(1970, 1, 1, tzinfo=timezone.utc), reverse=True)
+    debug_log("Fetched %d feeds (%d queries x %d locales), %d unique entries", len(urls), len(queries), len(locales), len(items))
+    items.sort(key=_sort_key, reverse=True)
     return items
@@ -1,6 +1,13 @@
 from __future__ import annotations
-import requests
-from typing import Dict
+import os
+import time
+from typing import Any, Dict
+from . import metrics
+from .utils import get_session
+
+def _api_base() -> str:
+    # GitHub Actions가 제공하는 GITHUB_API_URL (GHES 또는 로컬 벤치마크 서버) 사용
+    return os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 
 def _headers(token: str) -> Dict[str, str]:
     return {
@@ -9,10 +16,20 @@ def _headers(token: str) -> Dict[str, str]:
         "X-GitHub-Api-Version": "2022-11-28",
     }
 
-def find_or_create_issue(owner: str, repo: str, token: str, title: str, label: str) -> int:
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-    r = requests.get(url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": 50}, timeout=20)
+def _request(method: str, url: str, **kwargs: Any):
+    """GitHub API 호출 공통 래퍼 (호출 수/지연 시간 기록 후 raise_for_status)."""
+    t0 = time.perf_counter()
+    try:
+        r = get_session().request(method, url, timeout=20, **kwargs)
+    finally:
+        metrics.incr("github_calls")
+        metrics.observe("github_request", time.perf_counter() - t0)
     r.raise_for_status()
+    return r
+
+def find_or_create_issue(owner: str, repo: str, token: str, title: str, label: str) -> int:
+    url = f"{_api_base()}/repos/{owner}/{repo}/issues"
+    r = _request("GET", url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": 50})
     issues = r.json()
     for it in issues:
         if it.get("title") == title:
@@ -32,25 +49,21 @@ def find_or_create_issue(owner: str, repo: str, token: str, title: str, label: s
         ),
         "labels": [label]
     }    
-    r2 = requests.post(url, headers=_headers(token), json=payload, timeout=20)
-    r2.raise_for_status()
+    r2 = _request("POST", url, headers=_headers(token), json=payload)
     return int(r2.json()["number"])
 
 def create_comment(owner: str, repo: str, token: str, issue_number: int, body: str) -> None:
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    r = requests.post(url, headers=_headers(token), json={"body": body}, timeout=20)
-    r.raise_for_status()
+    url = f"{_api_base()}/repos/{owner}/{repo}/issues/{issue_number}/comments"
+    _request("POST", url, headers=_headers(token), json={"body": body})
 
 def list_open_issues_by_label(owner: str, repo: str, token: str, label: str, per_page: int = 100) -> list[dict]:
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues"
-    r = requests.get(url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": per_page}, timeout=20)
-    r.raise_for_status()
+    url = f"{_api_base()}/repos/{owner}/{repo}/issues"
+    r = _request("GET", url, headers=_headers(token), params={"state": "open", "labels": label, "per_page": per_page})
     return r.json() or []
 
 def close_issue(owner: str, repo: str, token: str, issue_number: int) -> None:
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-    r = requests.patch(url, headers=_headers(token), json={"state": "closed"}, timeout=20)
-    r.raise_for_status()
+    url = f"{_api_base()}/repos/{owner}/{repo}/issues/{issue_number}"
+    _request("PATCH", url, headers=_headers(token), json={"state": "closed"})
 
 def close_other_daily_issues(owner: str, repo: str, token: str, label: str, base_title: str, today_title: str, new_issue_number: int, new_issue_url: str) -> list[int]:
     """같은 라벨을 가진 모니터링 이슈 중 '오늘/현재' 이슈를 제외한 나머지 OPEN 이슈를 닫습니다."""
@@ -77,9 +90,8 @@ def close_other_daily_issues(owner: str, repo: str, token: str, label: str, base
 
 def comment_and_close_issue(owner: str, repo: str, token: str, issue_number: int, body: str) -> None:
     # 먼저 마무리 코멘트 작성
-    url_c = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    rc = requests.post(url_c, headers=_headers(token), json={"body": body}, timeout=20)
-    rc.raise_for_status()
+    url_c = f"{_api_base()}/repos/{owner}/{repo}/issues/{issue_number}/comments"
+    _request("POST", url_c, headers=_headers(token), json={"body": body})
     # 그 다음 이슈 Close
     close_issue(owner, repo, token, issue_number)
 
@@ -90,9 +102,8 @@ def comment_and_close_issue(owner: str, repo: str, token: str, issue_number: int
 # NEW: Issue 댓글 조회 (baseline 확보용)
 # =========================================================
 def list_comments(owner: str, repo: str, token: str, issue_number: int) -> list[dict]:
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}/comments"
-    r = requests.get(url, headers=_headers(token), timeout=20)
-    r.raise_for_status()
+    url = f"{_api_base()}/repos/{owner}/{repo}/issues/{issue_number}/comments"
+    r = _request("GET", url, headers=_headers(token))
     return r.json() or []
 
 
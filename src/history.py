@@ -0,0 +1,445 @@
+from __future__ import annotations
+import argparse
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, List, Sequence
+
+from . import metrics
+from .extract import RegulationInfo
+from .render import INTENSITY_BANDS, calculate_regulation_intensity_score, intensity_band
+from .utils import canonical_url, debug_log, open_sqlite
+
+# 분석된 모든 RegulationInfo를 로컬 SQLite에 누적합니다.
+# - 기사 하나 = regulations 한 행. 기사의 모든 URL(정규화)을 regulation_urls에 두어 어떤 URL로도 색인 조회 가능
+# - 한 번의 실행은 하나의 트랜잭션으로 기록 (중간에 실패하면 그 실행분은 남지 않음)
+# - 새로 기록된 기사는 같은 트랜잭션에서 trends(일/월 x 국가 x 규제명 x 강도 구간) 건수를 1씩 올립니다.
+#   추세 조회는 누적된 기록 양과 관계없이 해당 기간의 집계 행만 읽습니다.
+# - posts: 이슈(owner/repo#번호)별로 게시한 기사 URL. 중복 제거가 이슈 댓글을 다시 읽지 않고 이 색인을 조회합니다.
+
+DEFAULT_HISTORY_DB = "data/history.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS regulations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    canonical_url TEXT NOT NULL UNIQUE,
+    article_date TEXT NOT NULL,
+    country TEXT NOT NULL,
+    case_title TEXT NOT NULL,
+    article_title TEXT NOT NULL,
+    case_number TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    urls TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_regulations_date ON regulations(article_date);
+CREATE INDEX IF NOT EXISTS idx_regulations_country ON regulations(country, article_date);
+CREATE TABLE IF NOT EXISTS regulation_urls (
+    url TEXT PRIMARY KEY,
+    regulation_id INTEGER NOT NULL REFERENCES regulations(id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trends (
+    grain TEXT NOT NULL,
+    period TEXT NOT NULL,
+    country TEXT NOT NULL,
+    case_title TEXT NOT NULL,
+    band TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (grain, period, country, case_title, band)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS posts (
+    issue TEXT NOT NULL,
+    url TEXT NOT NULL,
+    posted_at REAL NOT NULL,
+    PRIMARY KEY (issue, url)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ran_at TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    inserted INTEGER NOT NULL
+);
+"""
+
+def history_path() -> str:
+    """HISTORY_DB 환경 변수 (기본 data/history.db). 빈 문자열이면 기록하지 않습니다."""
+    return os.environ.get("HISTORY_DB", DEFAULT_HISTORY_DB)
+
+def primary_url(reg: RegulationInfo) -> str:
+    """기사의 대표 URL. Google News 중계 링크보다 언론사 URL을 우선합니다."""
+    urls = [canonical_url(u) for u in reg.article_urls if u]
+    for u in urls:
+        if "news.google.com" not in u:
+            return u
+    return urls[0] if urls else ""
+
+class HistoryStore:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = open_sqlite(path)
+        self.conn.executescript(_SCHEMA)
+        # 추세 집계가 생기기 전의 DB라면 한 번만 기존 기록으로 채웁니다.
+        has_rows = self.conn.execute("SELECT EXISTS(SELECT 1 FROM regulations)").fetchone()[0]
+        has_trends = self.conn.execute("SELECT EXISTS(SELECT 1 FROM trends)").fetchone()[0]
+        if has_rows and not has_trends:
+            self.rebuild_trends()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _bump_trends(self, article_date: str, country: str, case_title: str, score: int) -> None:
+        band = intensity_band(score)
+        self.conn.executemany(
+            "INSERT INTO trends(grain, period, country, case_title, band, n) VALUES (?, ?, ?, ?, ?, 1) "
+            "ON CONFLICT(grain, period, country, case_title, band) DO UPDATE SET n = n + 1",
+            [
+                ("day", article_date[:10], country, case_title, band),
+                ("month", article_date[:7], country, case_title, band),
+            ],
+        )
+
+    def rebuild_trends(self) -> None:
+        """기존 기록 전체로 trends를 다시 계산합니다 (스키마 도입 시 1회)."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM trends")
+            for r in self.conn.execute("SELECT article_date, country, case_title, score FROM regulations").fetchall():
+                self._bump_trends(r["article_date"], r["country"], r["case_title"], r["score"])
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def _find_id(self, urls: Sequence[str]) -> int | None:
+        for u in urls:
+            row = self.conn.execute("SELECT regulation_id FROM regulation_urls WHERE url = ?", (u,)).fetchone()
+            if row is not None:
+                return int(row[0])
+        return None
+
+    def _insert(self, reg: RegulationInfo, key: str, urls: List[str], now: str) -> int:
+        score = calculate_regulation_intensity_score(reg.article_title, reg.reason)
+        cur = self.conn.execute(
+            "INSERT INTO regulations(canonical_url, article_date, country, case_title, article_title, case_number, "
+            "reason, keywords, score, urls, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key, reg.update_or_filed_date, reg.country, reg.case_title, reg.article_title, reg.case_number,
+                reg.reason, reg.matched_keywords, score,
+                json.dumps(sorted(reg.article_urls), ensure_ascii=False), now, now,
+            ),
+        )
+        self._bump_trends(reg.update_or_filed_date, reg.country, reg.case_title, score)
+        return int(cur.lastrowid)
+
+    def _touch(self, reg_id: int, reg: RegulationInfo, now: str) -> None:
+        # 이미 있는 기사: 마지막 확인 시각과 URL/키워드만 합칩니다.
+        row = self.conn.execute("SELECT urls, keywords FROM regulations WHERE id = ?", (reg_id,)).fetchone()
+        urls = sorted(set(json.loads(row["urls"])) | set(reg.article_urls))
+        keywords = {k.strip() for k in (row["keywords"] + "," + reg.matched_keywords).split(",") if k.strip()}
+        self.conn.execute(
+            "UPDATE regulations SET last_seen = ?, urls = ?, keywords = ? WHERE id = ?",
+            (now, json.dumps(urls, ensure_ascii=False), ", ".join(sorted(keywords)), reg_id),
+        )
+
+    def record(self, regulations: Iterable[RegulationInfo], now: datetime | None = None) -> List[RegulationInfo]:
+        """한 실행분을 하나의 트랜잭션으로 기록하고, 처음 기록된 항목만 반환합니다."""
+        ts = (now or datetime.now(timezone.utc)).isoformat(timespec="seconds")
+        inserted: List[RegulationInfo] = []
+        total = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for reg in regulations:
+                total += 1
+                urls = sorted({canonical_url(u) for u in reg.article_urls if u})
+                key = primary_url(reg)
+                if not key:
+                    continue
+                reg_id = self._find_id(urls)
+                if reg_id is None:
+                    reg_id = self._insert(reg, key, urls, ts)
+                    inserted.append(reg)
+                else:
+                    self._touch(reg_id, reg, ts)
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO regulation_urls(url, regulation_id) VALUES (?, ?)",
+                    [(u, reg_id) for u in urls],
+                )
+            self.conn.execute("INSERT INTO runs(ran_at, total, inserted) VALUES (?, ?, ?)", (ts, total, len(inserted)))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return inserted
+
+    def posted_urls(self, issue: str) -> set[str]:
+        """이슈에 이미 게시한 기사 URL(정규화)."""
+        return {r[0] for r in self.conn.execute("SELECT url FROM posts WHERE issue = ?", (issue,))}
+
+    def record_posts(self, issue: str, urls: Iterable[str]) -> None:
+        now = datetime.now(timezone.utc).timestamp()
+        rows = {(issue, canonical_url(u), now) for u in urls if u}
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.executemany("INSERT OR IGNORE INTO posts(issue, url, posted_at) VALUES (?, ?, ?)", rows)
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def query(
+        self,
+        *,
+        country: str = "",
+        since: str = "",
+        until: str = "",
+        min_score: int | None = None,
+        url: str = "",
+        text: str = "",
+        limit: int = 50,
+    ) -> List[dict]:
+        """조건에 맞는 기록을 기사일자 내림차순으로 반환합니다. 날짜는 YYYY-MM-DD."""
+        sql = "SELECT r.* FROM regulations r"
+        where, params = [], []
+        if url:
+            sql += " JOIN regulation_urls u ON u.regulation_id = r.id"
+            where.append("u.url = ?")
+            params.append(canonical_url(url))
+        if country:
+            where.append("r.country = ?")
+            params.append(country)
+        if since:
+            where.append("r.article_date >= ?")
+            params.append(since)
+        if until:
+            where.append("r.article_date <= ?")
+            params.append(until)
+        if min_score is not None:
+            where.append("r.score >= ?")
+            params.append(min_score)
+        if text:
+            where.append("(r.article_title LIKE ? OR r.case_title LIKE ?)")
+            params += [f"%{text}%", f"%{text}%"]
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY r.article_date DESC, r.id DESC LIMIT ?"
+        params.append(limit)
+        rows = []
+        for row in self.conn.execute(sql, params):
+            d = dict(row)
+            d["urls"] = json.loads(d["urls"])
+            rows.append(d)
+        return rows
+
+    def country_counts(self, since: str = "") -> List[tuple[str, int]]:
+        rows = self.conn.execute(
+            "SELECT country, COUNT(*) AS n FROM regulations WHERE article_date >= ? GROUP BY country ORDER BY n DESC",
+            (since,),
+        )
+        return [(r["country"], r["n"]) for r in rows]
+
+    def trends(
+        self,
+        grain: str,
+        periods: Sequence[str],
+        *,
+        country: str = "",
+        case_title: str = "",
+        bands: Sequence[str] = INTENSITY_BANDS,
+        countries: Sequence[str] = (),
+        subjects: Sequence[str] = (),
+    ) -> int:
+        """
+        기간(grain='day'|'month') 목록에 해당하는 건수 합계. 빈 조건은 전체를 뜻합니다.
+        countries는 국가 목록, subjects는 규제명에 포함될 문자열 목록입니다 (대소문자 무시, 하나라도 포함).
+        """
+        scope_sql, scope_params = _scope(countries, subjects)
+        total = 0
+        for period in periods:
+            sql = "SELECT COALESCE(SUM(n), 0) FROM trends WHERE grain = ? AND period = ?" + scope_sql
+            params: list = [grain, period, *scope_params]
+            if country:
+                sql += " AND country = ?"
+                params.append(country)
+            if case_title:
+                sql += " AND case_title = ?"
+                params.append(case_title)
+            if tuple(bands) != INTENSITY_BANDS:
+                sql += f" AND band IN ({','.join('?' * len(bands))})"
+                params += list(bands)
+            total += int(self.conn.execute(sql, params).fetchone()[0])
+        return total
+
+    def trend_breakdown(
+        self,
+        grain: str,
+        periods: Sequence[str],
+        by: str = "country",
+        *,
+        countries: Sequence[str] = (),
+        subjects: Sequence[str] = (),
+        bands: Sequence[str] = INTENSITY_BANDS,
+    ) -> List[tuple[str, int, int]]:
+        """기간 안의 (국가 또는 규제명, 전체 건수, high 구간 건수)를 건수 내림차순으로 반환합니다. 조건은 trends와 같습니다."""
+        if by not in ("country", "case_title"):
+            raise ValueError(f"unknown breakdown: {by}")
+        marks = ",".join("?" * len(periods))
+        scope_sql, scope_params = _scope(countries, subjects)
+        if tuple(bands) != INTENSITY_BANDS:
+            scope_sql += f" AND band IN ({','.join('?' * len(bands))})"
+            scope_params += list(bands)
+        rows = self.conn.execute(
+            f"SELECT {by} AS k, SUM(n) AS n, SUM(CASE WHEN band = 'high' THEN n ELSE 0 END) AS high "
+            f"FROM trends WHERE grain = ? AND period IN ({marks}){scope_sql} GROUP BY {by} ORDER BY n DESC, k",
+            [grain, *periods, *scope_params],
+        )
+        return [(r["k"], int(r["n"]), int(r["high"])) for r in rows]
+
+def _scope(countries: Sequence[str], subjects: Sequence[str]) -> tuple[str, list]:
+    """국가 목록/규제명 포함 문자열 조건 (빈 목록은 전체)."""
+    sql, params = "", []
+    if countries:
+        sql += f" AND country IN ({','.join('?' * len(countries))})"
+        params += list(countries)
+    if subjects:
+        # LIKE는 ASCII 대소문자를 구분하지 않음 (라우트/대상 필터의 subjects와 같은 의미)
+        sql += " AND (" + " OR ".join("case_title LIKE ?" for _ in subjects) + ")"
+        params += [f"%{s}%" for s in subjects]
+    return sql, params
+
+def _last_days(today: date, days: int) -> List[str]:
+    return [(today - timedelta(days=i)).isoformat() for i in range(days)]
+
+def trend_lines(
+    path: str | None = None,
+    today: date | None = None,
+    top: int = 3,
+    *,
+    countries: Sequence[str] = (),
+    subjects: Sequence[str] = (),
+    bands: Sequence[str] = INTENSITY_BANDS,
+) -> List[str]:
+    """
+    Slack용 추세 요약 줄 (이번 달 국가별 상위, 최근 7일 합계). 기록이 없거나 비활성화면 빈 목록.
+    countries/subjects/bands를 주면 그 범위(리포트 대상의 필터)만 집계합니다.
+    """
+    if not bands:
+        return []
+    path = history_path() if path is None else path
+    if not path or not os.path.exists(path):
+        return []
+    today = today or datetime.now(timezone.utc).date()
+    month = today.isoformat()[:7]
+    scope = {"countries": countries, "subjects": subjects}
+    store = HistoryStore(path)
+    try:
+        by_country = store.trend_breakdown("month", [month], bands=bands, **scope)
+        week = _last_days(today, 7)
+        week_total = store.trends("day", week, bands=bands, **scope)
+        week_high = store.trends("day", week, bands=("high",), **scope) if "high" in bands else 0
+    finally:
+        store.close()
+    if not by_country:
+        return []
+    parts = [f"{c}: {n}" + (f" (🔥 {h})" if h else "") for c, n, h in by_country[:top]]
+    return [
+        f"📈 *Trend ({month})*",
+        "└ " + " / ".join(parts),
+        f"└ 최근 7일: {week_total} items" + (f" (🔥 {week_high})" if week_high else ""),
+    ]
+
+def record_run(regulations: List[RegulationInfo], path: str | None = None) -> List[RegulationInfo] | None:
+    """HISTORY_DB에 실행 결과를 기록합니다. 비활성화되어 있거나 실패하면 None."""
+    path = history_path() if path is None else path
+    if not path:
+        return None
+    try:
+        store = HistoryStore(path)
+        try:
+            inserted = store.record(regulations)
+        finally:
+            store.close()
+    except Exception as e:
+        metrics.incr("history_errors")
+        debug_log("History record failed: %s", e)
+        return None
+    metrics.incr("history_inserted", len(inserted))
+    debug_log("History: %d regulations, %d new (%s)", len(regulations), len(inserted), path)
+    return inserted
+
+def posted_urls(issue: str, path: str | None = None) -> set[str] | None:
+    """
+    이슈에 게시한 URL 색인. 비활성화되어 있거나, 실패했거나, 이 이슈의 기록이 아직 없으면 None
+    (이 경우 호출자는 이슈 댓글에서 기준 목록을 만듭니다).
+    """
+    path = history_path() if path is None else path
+    if not path:
+        return None
+    try:
+        store = HistoryStore(path)
+        try:
+            urls = store.posted_urls(issue)
+        finally:
+            store.close()
+    except Exception as e:
+        debug_log("Posted URL lookup failed: %s", e)
+        return None
+    return urls or None
+
+def record_posts(issue: str, urls: Iterable[str], path: str | None = None) -> None:
+    path = history_path() if path is None else path
+    if not path:
+        return
+    try:
+        store = HistoryStore(path)
+        try:
+            store.record_posts(issue, urls)
+        finally:
+            store.close()
+    except Exception as e:
+        debug_log("Posted URL record failed: %s", e)
+
+def main(argv: List[str] | None = None) -> None:
+    # 예: python -m src.history --country EU --since 2026-01-01 --min-score 60
+    parser = argparse.ArgumentParser(prog="python -m src.history", description="규제 뉴스 기록 조회")
+    parser.add_argument("--db", default=history_path() or DEFAULT_HISTORY_DB)
+    parser.add_argument("--country", default="")
+    parser.add_argument("--since", default="", help="YYYY-MM-DD")
+    parser.add_argument("--until", default="", help="YYYY-MM-DD")
+    parser.add_argument("--min-score", type=int, default=None)
+    parser.add_argument("--url", default="", help="이 URL(정규화 기준)의 기록만")
+    parser.add_argument("--text", default="", help="제목/규제명 부분 일치")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--countries", action="store_true", help="국가별 건수만 출력")
+    parser.add_argument("--trends", choices=["day", "month"], help="기간별 집계 출력 (--period 필요)")
+    parser.add_argument("--period", action="append", default=[], help="YYYY-MM 또는 YYYY-MM-DD (여러 번 지정 가능)")
+    parser.add_argument("--by", choices=["country", "case_title"], default="country")
+    parser.add_argument("--json", action="store_true", help="JSON Lines로 출력")
+    args = parser.parse_args(argv)
+
+    store = HistoryStore(args.db)
+    try:
+        if args.trends:
+            for key, n, high in store.trend_breakdown(args.trends, args.period, by=args.by):
+                print(f"{n:6d}  (high {high:4d})  {key}")
+            return
+        if args.countries:
+            for country, n in store.country_counts(args.since):
+                print(f"{n:6d}  {country}")
+            return
+        rows = store.query(
+            country=args.country, since=args.since, until=args.until, min_score=args.min_score,
+            url=args.url, text=args.text, limit=args.limit,
+        )
+    finally:
+        store.close()
+    for r in rows:
+        if args.json:
+            print(json.dumps(r, ensure_ascii=False))
+        else:
+            print(f"{r['article_date']}  {r['score']:3d}  {r['country'][:12]:12}  {r['article_title'][:80]}  {r['canonical_url']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+from __future__ import annotations
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+from . import metrics
+from .utils import debug_log, open_sqlite
+
+# 언론사 호스트별 응답 시간/실패율(EWMA)을 실행 간에 유지합니다.
+# - 타임아웃은 호스트의 평균 응답 시간에 맞춰 줄어듭니다 (처음 보는 호스트는 최대값).
+# - 연속으로 실패하는 호스트는 회로를 열어(open) 기사 요청을 건너뛰고 RSS 제목/요약만 사용합니다.
+# - cooldown이 지나면 요청 하나만 시험 삼아(half-open) 보내고, 성공하면 회로를 닫습니다.
+
+DEFAULT_HOST_HEALTH_DB = "data/host_health.db"
+ALPHA = 0.3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    latency REAL NOT NULL,
+    failure_rate REAL NOT NULL,
+    consecutive_failures INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    opened_at REAL NOT NULL,
+    requests INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+@dataclass
+class HostStats:
+    host: str
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    consecutive_failures: int = 0
+    state: str = "closed"  # closed | open | half_open
+    opened_at: float = 0.0
+    requests: int = 0
+    updated_at: float = 0.0
+
+class HostHealth:
+    def __init__(
+        self,
+        path: str,
+        *,
+        min_timeout: float = 3.0,
+        max_timeout: float = 15.0,
+        failure_threshold: int = 3,
+        cooldown: float = 6 * 3600,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = path
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._dirty: set[str] = set()
+        conn = open_sqlite(path)
+        try:
+            conn.executescript(_SCHEMA)
+            self._hosts: Dict[str, HostStats] = {r["host"]: HostStats(**dict(r)) for r in conn.execute("SELECT * FROM hosts")}
+        finally:
+            conn.close()
+
+    def stats(self, host: str) -> HostStats:
+        return self._hosts.setdefault(host, HostStats(host))
+
+    def timeout(self, host: str) -> float:
+        """평균 응답 시간의 4배 (min_timeout~max_timeout). 기록이 없으면 max_timeout."""
+        s = self._hosts.get(host)
+        if s is None or not s.requests:
+            return self.max_timeout
+        return max(self.min_timeout, min(self.max_timeout, s.latency * 4))
+
+    def allow(self, host: str) -> bool:
+        """요청을 보내도 되는지. 회로가 열린 호스트는 cooldown 뒤 요청 하나만 허용합니다."""
+        with self._lock:
+            s = self._hosts.get(host)
+            if s is None or s.state == "closed":
+                return True
+            now = self.clock()
+            if s.state == "open" and now - s.opened_at >= self.cooldown:
+                s.state = "half_open"
+                s.opened_at = now
+                self._dirty.add(host)
+                debug_log("Circuit half-open, probing %s", host)
+                return True
+            # half_open: 시험 요청이 응답 없이 끝났다면 최대 타임아웃 뒤에 다시 허용
+            if s.state == "half_open" and now - s.opened_at >= self.max_timeout:
+                s.opened_at = now
+                return True
+            return False
+
+    def record(self, host: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            s = self.stats(host)
+            s.latency = seconds if not s.requests else ALPHA * seconds + (1 - ALPHA) * s.latency
+            s.failure_rate = ALPHA * (0.0 if ok else 1.0) + (1 - ALPHA) * s.failure_rate
+            s.requests += 1
+            s.updated_at = self.clock()
+            if ok:
+                if s.state != "closed":
+                    debug_log("Circuit closed: %s", host)
+                s.consecutive_failures = 0
+                s.state = "closed"
+            else:
+                s.consecutive_failures += 1
+                if s.state == "half_open" or (s.state == "closed" and s.consecutive_failures >= self.failure_threshold):
+                    s.state = "open"
+                    s.opened_at = self.clock()
+                    metrics.incr("circuits_opened")
+                    debug_log("Circuit opened: %s (%d consecutive failures)", host, s.consecutive_failures)
+            self._dirty.add(host)
+
+    def save(self) -> None:
+        """바뀐 호스트만 기록합니다."""
+        with self._lock:
+            rows = [tuple(vars(self._hosts[h]).values()) for h in self._dirty]
+            self._dirty.clear()
+        if not rows:
+            return
+        conn = open_sqlite(self.path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+_health: HostHealth | None = None
+_loaded = False
+
+def get() -> HostHealth | None:
+    """프로세스 공용 HostHealth (HOST_HEALTH_DB, 빈 값이면 비활성)."""
+    global _health, _loaded
+    if not _loaded:
+        _loaded = True
+        path = os.environ.get("HOST_HEALTH_DB", DEFAULT_HOST_HEALTH_DB)
+        if path:
+            try:
+                _health = HostHealth(
+                    path,
+                    min_timeout=float(os.environ.get("HOST_TIMEOUT_MIN", "3")),
+                    max_timeout=float(os.environ.get("HOST_TIMEOUT_MAX", "15")),
+                    failure_threshold=int(os.environ.get("HOST_FAILURE_THRESHOLD", "3")),
+                    cooldown=float(os.environ.get("HOST_COOLDOWN", str(6 * 3600))),
+                )
+            except Exception as e:
+                debug_log("Host health table unavailable: %s", e)
+    return _health
+
+def save() -> None:
+    if _health is not None:
+        try:
+            _health.save()
+        except Exception as e:
+            debug_log("Host health save failed: %s", e)
+
+def reset() -> None:
+    """공용 HostHealth를 버리고 다음 get()에서 HOST_HEALTH_DB를 다시 읽습니다 (벤치마크/테스트용)."""
+    global _health, _loaded
+    _health = None
+    _loaded = False
@@ -0,0 +1,130 @@
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Callable, ContextManager, Dict, Iterator, List
+
+# 단계(stage)별 소요 시간, 카운터, 지연 시간(latency)을 프로세스 안에 누적합니다.
+# 실행이 끝나면 JSON 요약과 Prometheus textfile 형식으로 내보냅니다.
+PREFIX = "ai_regulation"
+
+_lock = threading.Lock()
+_started_at = datetime.now(timezone.utc)
+_spans: Dict[str, float] = {}
+_counters: Dict[str, float] = {}
+_latencies: Dict[str, List[float]] = {}
+# 단계 진입 시 함께 실행할 컨텍스트 (예: profiling의 cProfile/tracemalloc)
+_span_hook: Callable[[str], ContextManager] | None = None
+
+def set_span_hook(hook: Callable[[str], ContextManager] | None) -> None:
+    global _span_hook
+    _span_hook = hook
+
+def reset() -> None:
+    global _started_at
+    with _lock:
+        _started_at = datetime.now(timezone.utc)
+        _spans.clear()
+        _counters.clear()
+        _latencies.clear()
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """with 블록의 경과 시간을 stage 이름으로 누적합니다. 훅(프로파일러) 자체의 시간은 포함하지 않습니다."""
+    with (_span_hook(name) if _span_hook is not None else nullcontext()):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            with _lock:
+                _spans[name] = _spans.get(name, 0.0) + elapsed
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+def observe(name: str, seconds: float) -> None:
+    """요청 지연 시간 등 개별 관측값을 기록합니다."""
+    with _lock:
+        _latencies.setdefault(name, []).append(seconds)
+
+def dump() -> dict:
+    """다른 프로세스(멀티 워커)의 누적값을 merge할 수 있도록 원시 카운터/관측값을 반환합니다."""
+    with _lock:
+        return {"counters": dict(_counters), "latencies": {k: list(v) for k, v in _latencies.items()}}
+
+def merge(data: dict) -> None:
+    """dump() 결과를 이 프로세스의 카운터/관측값에 더합니다. 단계 시간은 프로세스별 벽시계 시간이므로 합치지 않습니다."""
+    with _lock:
+        for name, value in data.get("counters", {}).items():
+            _counters[name] = _counters.get(name, 0) + value
+        for name, values in data.get("latencies", {}).items():
+            _latencies.setdefault(name, []).extend(values)
+
+def counter(name: str) -> float:
+    return _counters.get(name, 0)
+
+def snapshot() -> dict:
+    with _lock:
+        latencies = {}
+        for name, values in _latencies.items():
+            ordered = sorted(values)
+            latencies[name] = {
+                "count": len(ordered),
+                "sum": round(sum(ordered), 6),
+                "max": round(ordered[-1], 6),
+                "p50": round(ordered[len(ordered) // 2], 6),
+            }
+        return {
+            "started_at": _started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            "stages": {k: round(v, 6) for k, v in _spans.items()},
+            "counters": dict(_counters),
+            "latencies": latencies,
+        }
+
+def _number(value: float) -> str:
+    """Prometheus 값: 정수는 정수 그대로, 실수는 반올림 없이 (repr)."""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def render_prometheus(snap: dict | None = None) -> str:
+    snap = snap or snapshot()
+    lines = [
+        f"# HELP {PREFIX}_stage_seconds Wall-clock seconds spent per pipeline stage.",
+        f"# TYPE {PREFIX}_stage_seconds gauge",
+    ]
+    for stage, seconds in sorted(snap["stages"].items()):
+        lines.append(f'{PREFIX}_stage_seconds{{stage="{stage}"}} {_number(seconds)}')
+    for name, value in sorted(snap["counters"].items()):
+        lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+        lines.append(f"{PREFIX}_{name}_total {_number(value)}")
+    for name, stats in sorted(snap["latencies"].items()):
+        lines.append(f"# TYPE {PREFIX}_{name}_seconds summary")
+        lines.append(f"{PREFIX}_{name}_seconds_sum {_number(stats['sum'])}")
+        lines.append(f"{PREFIX}_{name}_seconds_count {stats['count']}")
+    lines.append(f"# TYPE {PREFIX}_last_run_timestamp_seconds gauge")
+    lines.append(f"{PREFIX}_last_run_timestamp_seconds {int(time.time())}")
+    return "\n".join(lines) + "\n"
+
+def _atomic_write(path: str, content: str) -> None:
+    # node_exporter textfile collector가 쓰다 만 파일을 읽지 않도록 rename으로 교체
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+def export(directory: str) -> tuple[str, str]:
+    """run_summary.json 과 ai_regulation.prom 을 directory에 기록하고 경로를 반환합니다."""
+    os.makedirs(directory, exist_ok=True)
+    snap = snapshot()
+    json_path = os.path.join(directory, "run_summary.json")
+    prom_path = os.path.join(directory, f"{PREFIX}.prom")
+    _atomic_write(json_path, json.dumps(snap, ensure_ascii=False, indent=2))
+    _atomic_write(prom_path, render_prometheus(snap))
+    return json_path, prom_path
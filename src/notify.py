@@ -0,0 +1,402 @@
+from __future__ import annotations
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Sequence, TYPE_CHECKING
+
+from . import metrics
+from .extract import RegulationInfo
+from .render import calculate_regulation_intensity_score
+from .slack import SlackRateLimited, post_to_slack
+from .utils import debug_log, open_sqlite
+
+if TYPE_CHECKING:
+    import sqlite3
+    from .run import Settings
+
+# Slack 알림 디스패처.
+# - 라우트(국가/규제명/강도 기준)별로 보낼 webhook과 메시지를 정하고, 메시지는 먼저 SQLite outbox에 기록합니다.
+# - 백그라운드 스레드가 outbox를 비우며 전송합니다. 같은 webhook으로 coalesce 시간 안에 쌓인 메시지는 하나로 합칩니다.
+# - 429(Retry-After)면 해당 webhook을 그 시간만큼 쉬고, 실패하면 지수 백오프로 재시도합니다.
+#   프로세스가 끝날 때까지 보내지 못한 메시지는 outbox에 남아 다음 실행에서 다시 보냅니다.
+# - 보낸 메시지는 바로 지우고, 재시도를 포기한(dead) 메시지는 보존 기간이 지나면 지웁니다.
+# - outbox에는 webhook URL(비밀값)을 저장하지 않습니다. URL의 해시(webhook_key)만 기록하고,
+#   전송 시 이번 프로세스에 등록된 라우트(register/submit)에서 URL을 찾습니다.
+#   등록되지 않은 webhook의 메시지는 그 라우트가 다시 등록되는 실행까지 남아 있습니다.
+
+DEFAULT_OUTBOX_DB = "data/outbox.db"
+DEFAULT_ROUTES_FILE = "data/notify_routes.yml"
+# Slack 메시지 text 최대 길이(40,000자)보다 여유 있게 나눕니다.
+MAX_TEXT = 35000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    route TEXT NOT NULL,
+    webhook_key TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, next_attempt_at);
+"""
+
+@dataclass
+class Route:
+    """조건이 모두 비어 있으면 전체 요약을, 아니면 조건에 맞는 항목 목록을 보냅니다."""
+    name: str
+    webhook: str
+    countries: tuple[str, ...] = ()
+    subjects: tuple[str, ...] = ()
+    min_score: int = 0
+
+    @property
+    def is_filtered(self) -> bool:
+        return bool(self.countries or self.subjects or self.min_score)
+
+    def matches(self, reg: RegulationInfo) -> bool:
+        if self.countries and reg.country not in self.countries:
+            return False
+        if self.subjects:
+            hay = f"{reg.case_title} {reg.article_title}".lower()
+            if not any(s.lower() in hay for s in self.subjects):
+                return False
+        if self.min_score and calculate_regulation_intensity_score(reg.article_title, reg.reason) < self.min_score:
+            return False
+        return True
+
+def load_routes(default_webhook: str, path: str | None = None) -> List[Route]:
+    """
+    기본 라우트(SLACK_WEBHOOK_URL, 전체 요약)와 NOTIFY_ROUTES 파일(기본 data/notify_routes.yml)의 라우트.
+    파일 항목: name, webhook 또는 webhook_env(웹훅 URL을 담은 환경 변수 이름), countries, subjects, min_score
+    """
+    routes: List[Route] = []
+    if default_webhook:
+        routes.append(Route(name="default", webhook=default_webhook))
+    path = path or os.environ.get("NOTIFY_ROUTES", DEFAULT_ROUTES_FILE)
+    if not os.path.exists(path):
+        return routes
+    import yaml
+    with open(path, "r", encoding="utf-8") as f:
+        entries = yaml.safe_load(f) or []
+    for i, e in enumerate(entries):
+        webhook = e.get("webhook") or os.environ.get(e.get("webhook_env", ""), "")
+        if not webhook:
+            debug_log("Notify route skipped (no webhook): %s", e.get("name", i))
+            continue
+        routes.append(Route(
+            name=str(e.get("name") or f"route{i}"),
+            webhook=webhook,
+            countries=tuple(e.get("countries") or ()),
+            subjects=tuple(e.get("subjects") or ()),
+            min_score=int(e.get("min_score") or 0),
+        ))
+    return routes
+
+def route_message(route: Route, summary_lines: Sequence[str], regulations: Sequence[RegulationInfo], limit: int = 10) -> str | None:
+    """라우트로 보낼 메시지. 조건이 있는 라우트에 맞는 항목이 없으면 None."""
+    if not route.is_filtered:
+        return "\n".join(summary_lines)
+    matched = [r for r in regulations if route.matches(r)]
+    if not matched:
+        return None
+    lines = list(summary_lines[:2]) + [f"🎯 *{route.name}*: {len(matched)} items"]
+    for r in matched[:limit]:
+        score = calculate_regulation_intensity_score(r.article_title, r.reason)
+        url = r.article_urls[0] if r.article_urls else ""
+        lines.append(f"• [{r.country}] {r.article_title} ({score})" + (f" <{url}|link>" if url else ""))
+    if len(matched) > limit:
+        lines.append(f"… +{len(matched) - limit}")
+    return "\n".join(lines)
+
+class Dispatcher:
+    def __init__(
+        self,
+        path: str,
+        *,
+        coalesce_seconds: float = 60.0,
+        min_interval: float = 1.0,
+        max_attempts: int = 8,
+        dead_retention: float = 7 * 86400.0,
+        sender: Callable[[str, str], None] = post_to_slack,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.path = path
+        self.coalesce_seconds = coalesce_seconds
+        # Slack incoming webhook은 webhook당 초당 1건 정도로 제한됩니다.
+        self.min_interval = min_interval
+        self.max_attempts = max_attempts
+        # 이 기간(초, 생성 시각 기준)이 지난 메시지는 지웁니다. dead 메시지는 원인 확인용으로 그동안만 남습니다.
+        self.dead_retention = dead_retention
+        self.sender = sender
+        self.clock = clock
+        self.sleep = sleep
+        self._local = threading.local()
+        # webhook_key -> URL (메모리에만 보관)
+        self._webhooks: Dict[str, str] = {}
+        self._blocked_until: Dict[str, float] = {}
+        self._last_sent: Dict[str, float] = {}
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        with self._connection() as conn:
+            _migrate(conn)
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connection(self) -> Iterator["sqlite3.Connection"]:
+        # 전송 스레드는 실행 내내 연결 하나를 쓰고 종료 시 닫습니다 (_loop).
+        # 그 밖의 스레드(submit/pending 호출 쪽)는 호출마다 열고 바로 닫아 연결이 남지 않게 합니다.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        conn = open_sqlite(self.path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def register(self, webhook: str) -> str:
+        """이 프로세스에서 보낼 수 있는 webhook으로 등록하고 outbox에 기록할 키를 반환합니다."""
+        key = webhook_key(webhook)
+        if key not in self._webhooks:
+            self._webhooks[key] = webhook
+            self._wake.set()
+        return key
+
+    def submit(self, route: str, webhook: str, text: str) -> None:
+        """메시지를 outbox에 기록하고 전송 스레드를 깨웁니다."""
+        key = self.register(webhook)
+        now = self.clock()
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT INTO outbox(route, webhook_key, text, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?)",
+                (route, key, text, now, now),
+            )
+        metrics.incr("notify_queued")
+        self._wake.set()
+
+    def pending(self) -> int:
+        return self.count("pending")
+
+    def count(self, status: str) -> int:
+        with self._connection() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM outbox WHERE status = ?", (status,)).fetchone()[0])
+
+    def _prune(self, conn, now: float) -> None:
+        # 이전 버전이 남긴 'sent' 행과 보존 기간이 지난 행(dead, 더 이상 등록되지 않는 라우트의 pending)을 지웁니다.
+        removed = conn.execute(
+            "DELETE FROM outbox WHERE status = 'sent' OR created_at < ?",
+            (now - self.dead_retention,),
+        ).rowcount
+        if removed:
+            metrics.incr("notify_pruned", removed)
+            debug_log("Notify outbox: pruned %d old rows", removed)
+
+    def flush(self, force: bool = False) -> int:
+        """
+        보낼 때가 된 메시지를 webhook별로 합쳐 전송하고 보낸 메시지 수를 반환합니다.
+        force=False면 가장 오래된 메시지가 coalesce 시간을 넘긴 webhook만 보냅니다.
+        """
+        with self._flush_lock, self._connection() as conn:
+            now = self.clock()
+            self._prune(conn, now)
+            rows = conn.execute(
+                "SELECT id, webhook_key, text, created_at, attempts FROM outbox "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id",
+                (now,),
+            ).fetchall()
+            groups: Dict[str, list] = {}
+            for row in rows:
+                groups.setdefault(row["webhook_key"], []).append(row)
+
+            sent = 0
+            for key, msgs in groups.items():
+                webhook = self._webhooks.get(key)
+                if webhook is None:
+                    continue
+                if self._blocked_until.get(webhook, 0) > now:
+                    continue
+                if not force and msgs[0]["created_at"] + self.coalesce_seconds > now:
+                    continue
+                for batch in _batches(msgs):
+                    if not self._send(conn, webhook, batch):
+                        break
+                    sent += len(batch)
+            return sent
+
+    def _send(self, conn, webhook: str, batch: list) -> bool:
+        ids = [r["id"] for r in batch]
+        marks = ",".join("?" * len(ids))
+        wait = self._last_sent.get(webhook, 0) + self.min_interval - self.clock()
+        if wait > 0:
+            self.sleep(wait)
+        try:
+            self.sender(webhook, "\n\n".join(r["text"] for r in batch))
+        except SlackRateLimited as e:
+            # 시도 횟수는 늘리지 않고 Retry-After 뒤로 미룸
+            until = self.clock() + e.retry_after
+            self._blocked_until[webhook] = until
+            conn.execute(f"UPDATE outbox SET next_attempt_at = ?, last_error = ? WHERE id IN ({marks})", (until, str(e), *ids))
+            debug_log("Slack rate limited, retry after %.0fs (%d messages)", e.retry_after, len(ids))
+            return False
+        except Exception as e:
+            metrics.incr("notify_errors")
+            attempts = max(r["attempts"] for r in batch) + 1
+            status = "dead" if attempts >= self.max_attempts else "pending"
+            retry_at = self.clock() + min(3600.0, 30.0 * 2 ** attempts)
+            conn.execute(
+                f"UPDATE outbox SET attempts = ?, status = ?, next_attempt_at = ?, last_error = ? WHERE id IN ({marks})",
+                (attempts, status, retry_at, str(e)[:500], *ids),
+            )
+            debug_log("Slack 전송 실패 (%d회, %s): %s", attempts, status, e)
+            return False
+        finally:
+            self._last_sent[webhook] = self.clock()
+        conn.execute(f"DELETE FROM outbox WHERE id IN ({marks})", ids)
+        metrics.incr("notify_sent", len(ids))
+        if len(ids) > 1:
+            metrics.incr("notify_coalesced", len(ids) - 1)
+        return True
+
+    def start(self, poll_seconds: float = 5.0) -> "Dispatcher":
+        """백그라운드 전송 스레드를 시작합니다. 이전 실행에서 남은 메시지도 바로 재시도합니다."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, args=(poll_seconds,), name="notify", daemon=True)
+            self._thread.start()
+        return self
+
+    def _loop(self, poll_seconds: float) -> None:
+        try:
+            self._local.conn = open_sqlite(self.path)
+            while not self._stop.is_set():
+                self.flush()
+                self._wake.wait(poll_seconds)
+                self._wake.clear()
+            self.flush(force=True)
+        except Exception as e:
+            debug_log("Notify thread failed: %s", e)
+        finally:
+            conn = getattr(self._local, "conn", None)
+            if conn is not None:
+                conn.close()
+                self._local.conn = None
+
+    def close(self, timeout: float | None = None) -> int:
+        """남은 메시지를 모두 보내려 시도하고 종료합니다. outbox에 남은 메시지 수를 반환합니다."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                debug_log("Notify thread still sending after %ss; remaining messages stay in outbox", timeout)
+        else:
+            self.flush(force=True)
+        left = self.pending()
+        if left:
+            debug_log("Notify outbox: %d messages pending for next run", left)
+        return left
+
+def webhook_key(webhook: str) -> str:
+    """outbox에 URL 대신 기록하는 webhook 식별자."""
+    return hashlib.sha256(webhook.encode("utf-8")).hexdigest()[:16]
+
+def _migrate(conn) -> None:
+    """webhook URL을 그대로 저장하던 이전 outbox를 webhook_key로 바꾸고, URL이 파일에 남지 않도록 VACUUM합니다."""
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(outbox)")}
+    if "webhook" not in columns:
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("ALTER TABLE outbox ADD COLUMN webhook_key TEXT NOT NULL DEFAULT ''")
+        for row in conn.execute("SELECT DISTINCT webhook FROM outbox").fetchall():
+            conn.execute("UPDATE outbox SET webhook_key = ? WHERE webhook = ?", (webhook_key(row["webhook"]), row["webhook"]))
+        conn.execute("ALTER TABLE outbox DROP COLUMN webhook")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("VACUUM")
+    debug_log("Notify outbox migrated: webhook URLs replaced with keys")
+
+def _batches(msgs: list) -> List[list]:
+    """합친 메시지가 MAX_TEXT를 넘지 않도록 나눕니다."""
+    batches: List[list] = []
+    size = 0
+    for m in msgs:
+        if batches and size + len(m["text"]) + 2 <= MAX_TEXT:
+            batches[-1].append(m)
+            size += len(m["text"]) + 2
+        else:
+            batches.append([m])
+            size = len(m["text"])
+    return batches
+
+_dispatcher: Dispatcher | None = None
+_start_lock = threading.Lock()
+
+def start() -> Dispatcher | None:
+    """프로세스 공용 디스패처를 시작합니다. outbox를 열 수 없으면 None (동기 전송으로 대체)."""
+    global _dispatcher
+    with _start_lock:
+        if _dispatcher is not None:
+            return _dispatcher
+        try:
+            _dispatcher = Dispatcher(
+                os.environ.get("OUTBOX_DB", DEFAULT_OUTBOX_DB),
+                coalesce_seconds=float(os.environ.get("NOTIFY_COALESCE_SECONDS", "60")),
+                dead_retention=float(os.environ.get("NOTIFY_DEAD_RETENTION_DAYS", "7")) * 86400,
+            ).start()
+        except Exception as e:
+            debug_log("Notify outbox unavailable, sending synchronously: %s", e)
+            return None
+        return _dispatcher
+
+def notify(
+    settings: "Settings",
+    regulations: Sequence[RegulationInfo],
+    summary_lines: Sequence[str],
+    routes: Sequence[Route] | None = None,
+) -> int:
+    """라우트별 메시지를 만들어 전송 대기열에 넣고, 넣은 메시지 수를 반환합니다. routes가 없으면 load_routes."""
+    dispatcher = start()
+    routes = load_routes(settings.slack_webhook) if routes is None else routes
+    if dispatcher is not None:
+        # 이번에 보낼 메시지가 없는 라우트도 등록해 이전 실행에서 남은 메시지를 보낼 수 있게 함
+        for route in routes:
+            dispatcher.register(route.webhook)
+    queued = 0
+    for route in routes:
+        text = route_message(route, summary_lines, regulations)
+        if text is None:
+            continue
+        queued += 1
+        if dispatcher is not None:
+            dispatcher.submit(route.name, route.webhook, text)
+            continue
+        try:
+            post_to_slack(route.webhook, text)
+        except Exception as e:
+            metrics.incr("slack_errors")
+            debug_log("Slack 전송 실패 (%s): %s", route.name, e)
+    return queued
+
+def shutdown(timeout: float | None = None) -> int:
+    """디스패처를 종료하며 남은 메시지를 보냅니다 (NOTIFY_FLUSH_TIMEOUT, 기본 30초)."""
+    global _dispatcher
+    if _dispatcher is None:
+        return 0
+    if timeout is None:
+        timeout = float(os.environ.get("NOTIFY_FLUSH_TIMEOUT", "30"))
+    left = _dispatcher.close(timeout)
+    _dispatcher = None
+    return left
@@ -0,0 +1,127 @@
+from __future__ import annotations
+import cProfile
+import io
+import os
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List
+
+from . import metrics
+from .utils import debug_log
+
+# `--profile` 사용 시 metrics.span으로 감싼 각 단계를 cProfile (+ 선택적으로 tracemalloc)으로 측정합니다.
+# 단계가 중첩되면(total 안의 fetch 등) 바깥 단계의 프로파일러를 잠시 멈춰 단계별 시간이 겹치지 않게 합니다.
+# cProfile은 메인 스레드만 측정합니다. 피드 수집(FEED_CONCURRENCY)이나 대상별 게시(TARGET_CONCURRENCY)처럼
+# 작업 스레드에서 도는 일은 해당 단계 pstats에 대기 시간(lock acquire 등)으로만 나타납니다.
+
+class StageProfiler:
+    def __init__(self, out_dir: str, top: int = 15, trace_memory: bool = False):
+        self.out_dir = out_dir
+        self.top = top
+        self.trace_memory = trace_memory
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._allocations: Dict[str, list] = {}
+        self._peaks: Dict[str, int] = {}
+        self._snapshot: tracemalloc.Snapshot | None = None
+        # (프로파일러, 자식 단계까지 포함한 지금까지의 최대 메모리)
+        self._stack: List[list] = []
+        self._main = threading.main_thread()
+
+    def hook(self, name: str):
+        # cProfile은 활성화한 스레드만 측정하므로 메인 스레드의 단계만 프로파일링
+        if threading.current_thread() is not self._main:
+            return nullcontext()
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        prof = self._profiles.setdefault(name, cProfile.Profile())
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if self._stack:
+            self._stack[-1][0].disable()
+        if tracing:
+            if self._stack:
+                # 바깥 단계의 최대값을 넘겨받은 뒤 이 단계 기준으로 다시 측정
+                self._stack[-1][1] = max(self._stack[-1][1], tracemalloc.get_traced_memory()[1])
+            else:
+                # 할당 위치 비교(스냅샷)는 비용이 커서 최상위 단계 경계에서만
+                self._snapshot = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+        self._stack.append([prof, 0])
+        prof.enable()
+        try:
+            yield
+        finally:
+            prof.disable()
+            _, child_peak = self._stack.pop()
+            if tracing:
+                peak = max(child_peak, tracemalloc.get_traced_memory()[1])
+                self._peaks[name] = max(self._peaks.get(name, 0), peak)
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], peak)
+                elif self._snapshot is not None:
+                    diff = tracemalloc.take_snapshot().compare_to(self._snapshot, "lineno")
+                    self._allocations.setdefault(name, []).extend(diff[: self.top])
+                    self._snapshot = None
+            if self._stack:
+                self._stack[-1][0].enable()
+
+    def hot_functions(self, name: str, limit: int | None = None) -> List[str]:
+        """단계별 자체 시간(tottime) 상위 함수 목록."""
+        stats = pstats.Stats(self._profiles[name])
+        rows = []
+        for (filename, lineno, func), (cc, nc, tt, ct, _) in stats.stats.items():
+            rows.append((tt, ct, nc, f"{os.path.basename(filename)}:{lineno}({func})"))
+        rows.sort(reverse=True)
+        return [f"{tt:8.4f}s self {ct:8.4f}s cum {nc:>7} calls  {where}" for tt, ct, nc, where in rows[: limit or self.top]]
+
+    def write(self) -> str:
+        """pstats 파일, 할당 상위 위치, 요약을 out_dir에 기록하고 요약 파일 경로를 반환합니다."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        summary = io.StringIO()
+        summary.write("# cProfile은 메인 스레드만 측정합니다 (작업 스레드의 피드 수집/게시는 대기 시간으로만 표시).\n\n")
+        for name, prof in self._profiles.items():
+            prof.dump_stats(os.path.join(self.out_dir, f"{name}.pstats"))
+            peak = self._peaks.get(name)
+            summary.write(f"== {name} ==" + (f" (peak traced memory {peak / 1_000_000:.2f} MB)" if peak else "") + "\n")
+            for line in self.hot_functions(name):
+                summary.write(f"  {line}\n")
+            allocs = sorted(self._allocations.get(name, []), key=lambda s: s.size_diff, reverse=True)[: self.top]
+            if allocs:
+                summary.write("  -- top allocations --\n")
+                for stat in allocs:
+                    frame = stat.traceback[0]
+                    summary.write(f"  {stat.size_diff / 1024:10.1f} KiB  {stat.count_diff:>7} blocks  {frame.filename}:{frame.lineno}\n")
+            summary.write("\n")
+        path = os.path.join(self.out_dir, "profile_summary.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(summary.getvalue())
+        for name in self._profiles:
+            debug_log("[profile] %s: %s", name, " | ".join(line.split("  ")[-1] for line in self.hot_functions(name, 3)))
+        return path
+
+_active: StageProfiler | None = None
+
+def enable(out_dir: str) -> StageProfiler:
+    """프로파일링을 켜고 metrics.span에 단계 훅을 등록합니다."""
+    global _active
+    trace_memory = os.environ.get("PROFILE_TRACEMALLOC", "0") == "1"
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _active = StageProfiler(out_dir, trace_memory=trace_memory)
+    metrics.set_span_hook(_active.hook)
+    return _active
+
+def finish() -> str | None:
+    """결과를 기록하고 훅을 해제합니다."""
+    global _active
+    if _active is None:
+        return None
+    metrics.set_span_hook(None)
+    path = _active.write()
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _active = None
+    return path
@@ -9,3 +9,16 @@ NEWS_QUERIES = [
     '("EU AI Act" OR "AI legal framework" OR "AI safety summit") when:3d',
     '("AI 저작권" OR "AI 책임법" OR "AI 윤리 가이드라인") when:3d',
 ]
+
+# Google News 에디션별 (hl, gl, ceid). 같은 쿼리를 여러 에디션에서 검색하여 지역 언론 보도까지 수집합니다.
+NEWS_LOCALES = {
+    "en-US": ("en-US", "US", "US:en"),
+    "ko-KR": ("ko", "KR", "KR:ko"),
+    "ja-JP": ("ja", "JP", "JP:ja"),
+    "de-DE": ("de", "DE", "DE:de"),
+    "fr-FR": ("fr", "FR", "FR:fr"),
+    "en-GB": ("en-GB", "GB", "GB:en"),
+}
+
+# NEWS_LOCALES 환경 변수(예: "en-US,ko-KR,ja-JP")가 없을 때 사용할 에디션
+DEFAULT_LOCALES = ["en-US", "ko-KR"]
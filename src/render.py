@@ -67,6 +67,25 @@ def calculate_regulation_intensity_score(title: str, reason: str) -> int:
     return min(score, 100)
 
 
+# 추세 집계(history.trends)에서 사용하는 강도 구간. format_intensity와 같은 경계값입니다.
+INTENSITY_BANDS = ("high", "elevated", "moderate", "low")
+
+def intensity_band(score: int) -> str:
+    if score >= 80:
+        return "high"
+    if score >= 60:
+        return "elevated"
+    if score >= 40:
+        return "moderate"
+    return "low"
+
+
+def bands_at_least(min_score: int) -> tuple[str, ...]:
+    """점수가 min_score 이상인 항목이 속할 수 있는 강도 구간 (구간 경계값이면 정확히 일치)."""
+    upper = {"high": 100, "elevated": 79, "moderate": 59, "low": 39}
+    return tuple(b for b in INTENSITY_BANDS if upper[b] >= min_score)
+
+
 def format_intensity(score: int) -> str:
     if score >= 80:
         return f"🔥 {score}"
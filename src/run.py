@@ -1,86 +1,183 @@
 from __future__ import annotations
+import argparse
 import os
 import re
+from dataclasses import dataclass
+from typing import List
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
 
-from .fetch import fetch_news
+from .fetch import NewsItem, fetch_news
 from .extract import load_known_cases, build_regulations_from_news, RegulationInfo
 from .render import render_markdown
 from .github_issue import find_or_create_issue, create_comment, close_other_daily_issues
 from .github_issue import list_comments
-from .slack import post_to_slack
-from .utils import debug_log
-from .dedup import apply_deduplication
+from . import content, hosthealth, metrics, notify, runstate, scheduler, targets
+from .utils import debug_log, is_debug
+from .dedup import apply_deduplication, baseline_urls
+from .history import posted_urls, record_posts, record_run, trend_lines
+from .search import open_archive
 
-def main() -> None:
+@dataclass
+class Settings:
+    owner: str
+    repo: str
+    gh_token: str
+    slack_webhook: str
+    base_title: str = "AI 규제/정책/법안 모니터링"
+    issue_label: str = "ai-regulation-monitor"
+    lookback_days: int = 3
+
+def load_settings(require_credentials: bool = True) -> Settings:
     # 0) 환경 변수 로드
     owner = os.environ.get("GITHUB_OWNER")
     repo = os.environ.get("GITHUB_REPO")
     gh_token = os.environ.get("GITHUB_TOKEN")
     slack_webhook = os.environ.get("SLACK_WEBHOOK_URL")
 
-    if not all([owner, repo, gh_token, slack_webhook]):
+    if require_credentials and not all([owner, repo, gh_token, slack_webhook]):
         missing = [k for k, v in {"GITHUB_OWNER": owner, "GITHUB_REPO": repo, "GITHUB_TOKEN": gh_token, "SLACK_WEBHOOK_URL": slack_webhook}.items() if not v]
         raise ValueError(f"필수 환경 변수가 누락되었습니다: {', '.join(missing)}")
 
-    base_title = os.environ.get("ISSUE_TITLE_BASE", "AI 규제/정책/법안 모니터링")
-    lookback_days = int(os.environ.get("LOOKBACK_DAYS", "3"))
-    # 필요 시 2로 변경: 환경변수 LOOKBACK_DAYS=2
-    
+    return Settings(
+        owner=owner or "",
+        repo=repo or "",
+        gh_token=gh_token or "",
+        slack_webhook=slack_webhook or "",
+        base_title=os.environ.get("ISSUE_TITLE_BASE", "AI 규제/정책/법안 모니터링"),
+        issue_label=os.environ.get("ISSUE_LABEL", "ai-regulation-monitor"),
+        # 필요 시 2로 변경: 환경변수 LOOKBACK_DAYS=2
+        lookback_days=int(os.environ.get("LOOKBACK_DAYS", "3")),
+    )
+
+def collect(
+    settings: Settings,
+    workers: int = 1,
+    archive: bool = False,
+    news: List[NewsItem] | None = None,
+    deadline: scheduler.Deadline | None = None,
+    deferred_path: str = "",
+) -> List[RegulationInfo]:
+    """
+    뉴스 수집 및 규제 정보 추출 (fetch -> extract). archive=True면 관련 기사 본문을 검색용으로 보관합니다.
+    news가 주어지면 수집 단계를 건너뜁니다.
+    deadline이 주어지면 기대 가치 순서로 기사를 처리하다가 시간이 다 되면 멈추고,
+    처리하지 못한 항목을 deferred_path에 남깁니다 (이전 실행에서 남은 항목은 가장 먼저 처리).
+    """
+    carried = scheduler.load_deferred(deferred_path) if deferred_path else []
+    if carried:
+        metrics.incr("deferred_carried", len(carried))
+        debug_log("이전 실행에서 이월된 %d건을 먼저 처리", len(carried))
+    if workers > 1:
+        from .shard import run_sharded
+        with metrics.span("sharded"):
+            # 이월 항목은 article 작업으로 넣어 함께 처리 (멀티 워커 실행에는 예산을 적용하지 않음)
+            regulations = run_sharded(
+                settings.lookback_days, workers, os.environ.get("QUEUE_DB", "data/workqueue.db"),
+                archive=archive, items=carried,
+            )
+        if deferred_path:
+            scheduler.save_deferred(deferred_path, [])
+        return regulations
+    if news is None:
+        with metrics.span("fetch"):
+            news = fetch_news()
+    if deadline is not None:
+        plan = scheduler.Plan(scheduler.prioritize(news, carried), deadline)
+    else:
+        plan = scheduler.Plan(scheduler.carry_over(news, carried), None)
+    store = open_archive() if archive else None
+    try:
+        with metrics.span("extract"):
+            known = load_known_cases()
+            regulations = build_regulations_from_news(
+                plan, known, lookback_days=settings.lookback_days, page_sink=store.add if store else None
+            )
+        if deferred_path:
+            scheduler.save_deferred(deferred_path, plan.deferred)
+        return regulations
+    finally:
+        if store is not None:
+            with metrics.span("history"):
+                store.close()
+
+def publish(
+    settings: Settings,
+    regulations: List[RegulationInfo],
+    routes: List[notify.Route] | None = None,
+    trend_scope: dict | None = None,
+) -> None:
+    """
+    리포트를 렌더링하여 GitHub Issue 댓글과 Slack으로 전송합니다. routes가 없으면 NOTIFY_ROUTES 라우트를 사용합니다.
+    trend_scope는 Slack 추세 요약의 집계 범위(history.trend_lines의 countries/subjects/bands)로, 없으면 전체입니다.
+    """
+    owner, repo, gh_token = settings.owner, settings.repo, settings.gh_token
+    lookback_days = settings.lookback_days
+    base_title = settings.base_title
+    issue_label = settings.issue_label
+
     # KST 기준 날짜 생성
     now_kst = datetime.now(ZoneInfo("Asia/Seoul"))
     run_ts_kst = now_kst.strftime("%Y-%m-%d %H:%M")
     issue_day_kst = now_kst.strftime("%Y-%m-%d")
     issue_title = f"{base_title} ({issue_day_kst})"
-    debug_log(f"KST 기준 실행시각: {run_ts_kst}")
-    
-    issue_label = os.environ.get("ISSUE_LABEL", "ai-regulation-monitor")
-
-    # 2) 뉴스 수집
-    news = fetch_news()
-    known = load_known_cases()
-    regulations = build_regulations_from_news(news, known, lookback_days=lookback_days)
+    debug_log("KST 기준 실행시각: %s", run_ts_kst)
 
     # 3) 렌더링
-    md = render_markdown(
-        regulations,
-        lookback_days=lookback_days,
-    )    
-    
-    debug_log(f"📊 수집 및 분석 완료 (최근 {lookback_days}일)")
-    debug_log(f"  ├ News: {len(regulations)}건")
-
-    debug_log("===== REPORT PREVIEW (First 1000 chars) =====")
-    debug_log(md[:1000])
-    debug_log(f"Report full length: {len(md)}")
+    with metrics.span("render"):
+        md = render_markdown(
+            regulations,
+            lookback_days=lookback_days,
+        )
+
+    debug_log("📊 수집 및 분석 완료 (최근 %d일)", lookback_days)
+    debug_log("  ├ News: %d건", len(regulations))
+
+    if is_debug():
+        debug_log("===== REPORT PREVIEW (First 1000 chars) =====")
+        debug_log(md[:1000])
+        debug_log("Report full length: %d", len(md))
 
     # 4) GitHub Issue 작업
-    issue_no = find_or_create_issue(owner, repo, gh_token, issue_title, issue_label)
-    issue_url = f"https://github.com/{owner}/{repo}/issues/{issue_no}"
-   
+    with metrics.span("github"):
+        issue_no = find_or_create_issue(owner, repo, gh_token, issue_title, issue_label)
+        issue_url = f"https://github.com/{owner}/{repo}/issues/{issue_no}"
+    # 이 이슈에 게시한 URL은 HISTORY_DB 색인에서 조회하고, 기록이 없을 때만(기록 도입 전 이슈 등) 댓글을 읽습니다.
+    issue_key = f"{owner}/{repo}#{issue_no}"
+    with metrics.span("history"):
+        posted = posted_urls(issue_key)
+    comments: List[dict] = []
+    if posted is None:
+        with metrics.span("github"):
+            comments = list_comments(owner, repo, gh_token, issue_no)
+    else:
+        metrics.incr("dedup_index_hits")
 
     # =========================================================
     # Baseline 비교 로직 (Modularized)
     # =========================================================
-    comments = list_comments(owner, repo, gh_token, issue_no)
-    md, dedup_stats = apply_deduplication(md, comments)
+    with metrics.span("dedup"):
+        md, dedup_stats = apply_deduplication(md, comments, base_urls=posted)
 
     # 4.1) 실행 시각을 맨 위로 (중복 제거 요약보다 위로)
     md = f"### 실행 시각(KST): {run_ts_kst}\n\n" + md
 
-    # 이전 날짜 이슈 Close
-    closed_nums = close_other_daily_issues(owner, repo, gh_token, issue_label, base_title, issue_title, issue_no, issue_url)
-    if closed_nums:
-        debug_log(f"이전 날짜 이슈 자동 Close: {closed_nums}")
-    
+    with metrics.span("github"):
+        # 이전 날짜 이슈 Close
+        closed_nums = close_other_daily_issues(owner, repo, gh_token, issue_label, base_title, issue_title, issue_no, issue_url)
+        if closed_nums:
+            debug_log("이전 날짜 이슈 자동 Close: %s", closed_nums)
+
+        comment_body = f"\n\n{md}"
+        create_comment(owner, repo, gh_token, issue_no, comment_body)
+        debug_log("Issue #%s 댓글 업로드 완료", issue_no)
+    with metrics.span("history"):
+        # 리포트 표의 링크(article_urls[0])를 기록. 댓글에서 읽은 기준 목록도 함께 색인해 다음 실행부터는 댓글을 읽지 않음
+        record_posts(issue_key, [r.article_urls[0] for r in regulations if r.article_urls] + sorted(baseline_urls(comments)))
+
     # KST 기준 타임스탬프
     timestamp = datetime.now(ZoneInfo("Asia/Seoul")).strftime("%Y-%m-%d %H:%M KST")
 
-    comment_body = f"\n\n{md}"
-    create_comment(owner, repo, gh_token, issue_no, comment_body)
-    debug_log(f"Issue #{issue_no} 댓글 업로드 완료")
-
     # 5) Slack 요약 전송
     # ============================================
     # Slack 출력 개선 (최종 포맷)
@@ -108,13 +205,153 @@ def main() -> None:
     slack_lines.append(f"└ News: {len(regulations)} items total")
     slack_lines.append("")
 
+    # 추세 (HISTORY_DB 집계 기준, 기록이 없으면 생략)
+    try:
+        with metrics.span("history"):
+            trend = trend_lines(**(trend_scope or {}))
+    except Exception as e:
+        debug_log("Trend summary failed: %s", e)
+        trend = []
+    if trend:
+        slack_lines.extend(trend)
+        slack_lines.append("")
+
     # GitHub
     slack_lines.append(f"🔗 *GitHub:* <{issue_url}|#{issue_no}>")
+    # 전송은 notify 디스패처의 백그라운드 스레드가 담당 (실패 시 outbox에 남아 다음 실행에서 재시도)
+    with metrics.span("slack"):
+        queued = notify.notify(settings, regulations, slack_lines, routes=routes)
+    debug_log("Slack 알림 %d건 대기열 등록", queued)
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m src.run", description="AI 규제/정책 모니터링")
+    parser.add_argument("--daemon", action="store_true", help="상주 모드: 쿼리별 적응형 주기로 폴링하고 새 항목이 있을 때만 게시")
+    parser.add_argument("--check-config", action="store_true", help="환경 변수만 검증하고 종료")
+    parser.add_argument("--dry-run", action="store_true", help="수집/분석/렌더링만 수행하고 리포트를 출력 (GitHub/Slack 전송 안 함)")
+    parser.add_argument("--metrics-dir", default=os.environ.get("METRICS_DIR", ""), help="run_summary.json / Prometheus textfile 출력 디렉터리")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WORKERS", "1")), help="N>1이면 SQLite 작업 큐와 워커 프로세스 N개로 수집/분석")
+    parser.add_argument("--profile", nargs="?", const="profile", default="", metavar="DIR", help="단계별 cProfile/tracemalloc 결과를 DIR(기본: profile/)에 기록")
+    parser.add_argument("--force", action="store_true", help="피드가 지난 게시 때와 같아도 분석/게시")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get("RUN_BUDGET_SECONDS", "0")), help="실행 시간 예산(초). 게시할 시간을 남기고 기사 요청을 멈추며 남은 항목은 다음 실행으로 이월 (0이면 제한 없음)")
+    parser.add_argument("--targets", default=targets.targets_path(), metavar="FILE", help="리포트 대상 목록 YAML (기본: TARGETS_FILE 또는 data/targets.yml이 있을 때). 한 번 수집/분석해 대상별로 병렬 게시")
+    parser.add_argument("--backfill", nargs=2, metavar=("START", "END"), help="START~END(YYYY-MM-DD) 기간을 구간별로 수집해 HISTORY_DB에만 기록 (중단 시 이어서 실행)")
+    parser.add_argument("--slice-days", type=int, default=int(os.environ.get("BACKFILL_SLICE_DAYS", "7")), help="--backfill 구간 크기(일)")
+    args = parser.parse_args(argv)
+    if args.daemon and args.dry_run:
+        parser.error("--daemon은 --dry-run과 함께 쓸 수 없습니다 (상주 모드는 새 항목을 항상 게시합니다)")
+
+    # 예산은 프로세스 시작 시점부터 계산 (피드 수집 시간 포함)
+    deadline = scheduler.Deadline(args.budget) if args.budget > 0 else None
+    if args.backfill:
+        _backfill(args)
+        return
+
+    # 대상 파일이 있으면 GitHub/Slack 설정은 대상별로 검증 (환경 변수는 기본값)
+    targets_file = "" if args.daemon else args.targets
+    settings = load_settings(require_credentials=not args.dry_run and not targets_file)
+    target_list = targets.load_targets(settings, targets_file, require_credentials=not args.dry_run) if targets_file else []
+    if args.check_config:
+        if not target_list:
+            print(f"OK: {settings.owner}/{settings.repo} label={settings.issue_label} lookback={settings.lookback_days}d")
+        for t in target_list:
+            print(f"OK [{t.name}]: {t.settings.owner}/{t.settings.repo} label={t.settings.issue_label} slack={'yes' if t.settings.slack_webhook else 'no'}")
+        return
+    if args.profile:
+        from . import profiling
+        profiling.enable(args.profile)
+    if not args.dry_run:
+        # 이전 실행에서 보내지 못한 알림을 수집/분석과 병렬로 재전송
+        notify.start()
+
+    if args.daemon:
+        from .daemon import run_daemon
+        try:
+            run_daemon(settings, metrics_dir=args.metrics_dir)
+        finally:
+            notify.shutdown()
+            hosthealth.save()
+            content.save_profiles()
+            _finish_profile(args.profile)
+        return
+
+    # 피드 지문 비교는 코디네이터가 피드를 직접 받는 단일 프로세스 실행에서만 사용
+    state_path = os.environ.get("RUN_STATE", runstate.DEFAULT_RUN_STATE)
+    check_unchanged = bool(state_path) and not args.dry_run and args.workers <= 1
+    deferred_path = "" if args.dry_run else os.environ.get("DEFERRED_QUEUE", scheduler.DEFAULT_DEFERRED_QUEUE)
     try:
-        post_to_slack(slack_webhook, "\n".join(slack_lines))
-        debug_log(f"Slack 전송 완료")
-    except Exception as e:
-        debug_log(f"Slack 전송 실패: {e}")
-        
+        with metrics.span("total"):
+            # 2) 뉴스 수집
+            news, fp = None, ""
+            if check_unchanged:
+                with metrics.span("fetch"):
+                    news = fetch_news()
+                fp = runstate.fingerprint(news)
+                heartbeat = float(os.environ.get("HEARTBEAT_HOURS", "24")) * 3600
+                # 이월된 항목이 남아 있으면 피드가 같아도 처리
+                pending = bool(deferred_path) and os.path.exists(deferred_path)
+                if not args.force and not pending and runstate.unchanged(runstate.load(state_path), fp, heartbeat):
+                    metrics.incr("runs_skipped")
+                    debug_log("피드 변화 없음 (fingerprint %s), 분석/게시 생략", fp[:12])
+                    return
+            regulations = collect(
+                settings, workers=args.workers, archive=not args.dry_run, news=news,
+                deadline=deadline, deferred_path=deferred_path,
+            )
+            if args.dry_run:
+                if not target_list:
+                    print(render_markdown(regulations, lookback_days=settings.lookback_days))
+                for t in target_list:
+                    print(f"<!-- target: {t.name} -->")
+                    print(render_markdown(t.select(regulations), lookback_days=settings.lookback_days))
+            else:
+                # 게시 전에 로컬 기록(HISTORY_DB)에 먼저 남겨, 게시가 실패해도 분석 결과는 보존
+                with metrics.span("history"):
+                    record_run(regulations)
+                if target_list:
+                    failed = targets.publish_targets(target_list, regulations, publish)
+                    if failed:
+                        raise RuntimeError(f"게시 실패 대상: {', '.join(failed)}")
+                else:
+                    publish(settings, regulations)
+                if fp:
+                    runstate.save(state_path, fp)
+    finally:
+        notify.shutdown()
+        hosthealth.save()
+        content.save_profiles()
+        if args.metrics_dir:
+            paths = metrics.export(args.metrics_dir)
+            debug_log("Metrics exported: %s", ", ".join(paths))
+        _finish_profile(args.profile)
+
+def _backfill(args: argparse.Namespace) -> None:
+    from datetime import date
+    from .backfill import DEFAULT_BACKFILL_STATE, run_backfill
+    start, end = (date.fromisoformat(x) for x in args.backfill)
+    if args.profile:
+        from . import profiling
+        profiling.enable(args.profile)
+    try:
+        with metrics.span("total"):
+            n = run_backfill(
+                start, end,
+                slice_days=args.slice_days,
+                state_path=os.environ.get("BACKFILL_STATE", DEFAULT_BACKFILL_STATE),
+            )
+        print(f"Backfill {start}~{end}: {n} regulations recorded")
+    finally:
+        hosthealth.save()
+        content.save_profiles()
+        if args.metrics_dir:
+            metrics.export(args.metrics_dir)
+        _finish_profile(args.profile)
+
+def _finish_profile(profile_dir: str) -> None:
+    if profile_dir:
+        from . import profiling
+        path = profiling.finish()
+        debug_log("Profile written: %s", path)
+
 if __name__ == "__main__":
     main()
+
@@ -0,0 +1,52 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from typing import Iterable
+
+from .utils import canonical_url, debug_log
+
+# 직전 게시 실행의 피드 지문을 보관합니다.
+# 수집한 피드 항목(정규화 URL + 게시 시각)이 지난번과 같으면 분석/렌더링/게시를 건너뜁니다.
+# 단, 마지막 게시 후 heartbeat 시간이 지나면 변화가 없어도 한 번 게시합니다.
+
+DEFAULT_RUN_STATE = "data/run_state.json"
+
+def fingerprint(news: Iterable) -> str:
+    """피드 항목 순서/에디션 파라미터와 무관한 지문 (sha256)."""
+    keys = sorted(
+        f"{canonical_url(it.url)}\t{it.published_at.isoformat() if it.published_at else ''}" for it in news
+    )
+    h = hashlib.sha256()
+    for k in keys:
+        h.update(k.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+def load(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        debug_log("Run state unreadable, ignoring: %s", e)
+        return {}
+
+def save(path: str, fp: str, now: float | None = None) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    state = {"fingerprint": fp, "published_at": time.time() if now is None else now}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def unchanged(state: dict, fp: str, heartbeat_seconds: float, now: float | None = None) -> bool:
+    """지문이 같고 마지막 게시가 heartbeat 이내이면 True (이번 실행은 건너뛰어도 됨)."""
+    if not state or state.get("fingerprint") != fp:
+        return False
+    now = time.time() if now is None else now
+    return now - float(state.get("published_at", 0)) < heartbeat_seconds
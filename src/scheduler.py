@@ -0,0 +1,125 @@
+from __future__ import annotations
+import json
+import os
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List, Sequence
+from urllib.parse import urlsplit
+
+from . import hosthealth, metrics
+from .fetch import NewsItem
+from .render import calculate_regulation_intensity_score
+from .utils import canonical_url, debug_log
+
+# 실행 시간 예산(예: GitHub Actions 작업 제한) 안에서 게시까지 마치기 위한 기사 처리 순서/중단 관리.
+# - 기사 요청 전에 제목/요약 사전 점수, 최신성, 언론사 호스트 상태로 기대 가치를 매겨 높은 순서로 처리합니다.
+# - 남은 시간이 게시용 여유분(reserve)보다 적어지면 새 기사 요청을 멈추고, 처리하지 못한 항목은
+#   deferred 큐(DEFERRED_QUEUE)에 저장해 다음 실행에서 가장 먼저 처리합니다.
+
+DEFAULT_DEFERRED_QUEUE = "data/deferred.json"
+# 게시 시작 전에 남겨 둘 최대 시간(초). 예산이 작으면 예산의 1/4을 사용합니다.
+DEFAULT_RESERVE_SECONDS = 90.0
+RECENCY_HOURS = 72.0
+
+class Deadline:
+    """budget초 안에 끝내야 하는 실행. reserve초가 남으면 expired()가 True가 됩니다."""
+
+    def __init__(self, budget: float, reserve: float | None = None, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.budget = budget
+        self.reserve = min(DEFAULT_RESERVE_SECONDS, budget / 4) if reserve is None else reserve
+        self.started = clock()
+
+    def remaining(self) -> float:
+        return self.budget - (self.clock() - self.started)
+
+    def expired(self) -> bool:
+        return self.remaining() <= self.reserve
+
+def expected_value(item: NewsItem, now: datetime | None = None) -> float:
+    """기사 요청 한 건의 기대 가치: 사전 강도 점수 + 최신성 가산(최대 20) x 호스트 성공률."""
+    now = now or datetime.now(timezone.utc)
+    value = float(calculate_regulation_intensity_score(item.title, item.summary))
+    if item.published_at is not None:
+        age_hours = max(0.0, (now - item.published_at).total_seconds() / 3600)
+        value += 20.0 * max(0.0, 1.0 - age_hours / RECENCY_HOURS)
+    health = hosthealth.get()
+    host = urlsplit(item.source_url).netloc.lower() if item.source_url else ""
+    if health is not None and host:
+        value *= 1.0 - health.stats(host).failure_rate
+    return value
+
+def carry_over(news: Sequence[NewsItem], carried: Sequence[NewsItem]) -> List[NewsItem]:
+    """이월된 항목을 앞에 두고, 이번 피드에 다시 나온 같은 기사(정규화 URL)는 뺍니다."""
+    if not carried:
+        return list(news)
+    seen = {canonical_url(it.url) for it in carried}
+    return list(carried) + [it for it in news if canonical_url(it.url) not in seen]
+
+def prioritize(news: Sequence[NewsItem], carried: Sequence[NewsItem] = (), now: datetime | None = None) -> List[NewsItem]:
+    """이월된 항목을 먼저, 나머지는 기대 가치가 높은 순서로."""
+    now = now or datetime.now(timezone.utc)
+    items = carry_over(news, carried)
+    fresh = items[len(carried):]
+    fresh.sort(key=lambda it: expected_value(it, now), reverse=True)
+    return items[:len(carried)] + fresh
+
+class Plan:
+    """
+    build_regulations_from_news에 그대로 넘길 수 있는 항목 목록.
+    순회 중 deadline이 지나면 멈추고, 남은 항목을 deferred에 담습니다.
+    """
+
+    def __init__(self, items: Sequence[NewsItem], deadline: Deadline | None):
+        self.items = list(items)
+        self.deadline = deadline
+        self.deferred: List[NewsItem] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[NewsItem]:
+        self.deferred = []
+        for i, item in enumerate(self.items):
+            if self.deadline is not None and self.deadline.expired():
+                self.deferred = self.items[i:]
+                metrics.incr("items_deferred", len(self.deferred))
+                debug_log("Budget nearly used (%.1fs left), deferring %d items", self.deadline.remaining(), len(self.deferred))
+                return
+            yield item
+
+def load_deferred(path: str) -> List[NewsItem]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    except FileNotFoundError:
+        return []
+    except Exception as e:
+        debug_log("Deferred queue unreadable, ignoring: %s", e)
+        return []
+    items = []
+    for row in rows:
+        published = row.get("published_at")
+        row["published_at"] = datetime.fromisoformat(published) if published else None
+        items.append(NewsItem(**row))
+    return items
+
+def save_deferred(path: str, items: Sequence[NewsItem]) -> None:
+    """이월 항목을 원자적으로 기록합니다. 비어 있으면 파일을 지웁니다."""
+    if not items:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    rows = []
+    for it in items:
+        row = asdict(it)
+        row["published_at"] = it.published_at.isoformat() if it.published_at else None
+        rows.append(row)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False)
+    os.replace(tmp, path)
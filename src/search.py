@@ -0,0 +1,168 @@
+from __future__ import annotations
+import argparse
+import re
+import zlib
+from dataclasses import dataclass
+from typing import List
+
+from . import metrics
+from .extract import RegulationInfo
+from .history import history_path, primary_url
+from .utils import debug_log, open_sqlite
+
+# 관련 기사 본문(fetch_page_text 결과, 최대 20KB)을 zlib로 압축해 보관하고 FTS5로 색인합니다.
+# 색인은 contentless FTS5(본문을 다시 저장하지 않음)이고, 스니펫은 압축 본문을 풀어 Python에서 만듭니다.
+# history와 같은 DB 파일(HISTORY_DB)을 사용하며, 기사는 정규화 URL 기준으로 한 번만 보관합니다.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS article_text (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    canonical_url TEXT NOT NULL UNIQUE,
+    article_date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_article_text_date ON article_text(article_date);
+CREATE VIRTUAL TABLE IF NOT EXISTS article_fts USING fts5(
+    title, body, content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+@dataclass
+class SearchHit:
+    canonical_url: str
+    article_date: str
+    title: str
+    rank: float
+    snippet: str
+
+class ArticleArchive:
+    def __init__(self, path: str, batch_size: int = 200):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = open_sqlite(path)
+        self.conn.executescript(_SCHEMA)
+        self._pending: List[tuple[str, str, str, str]] = []
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
+
+    def add(self, info: RegulationInfo, text: str) -> None:
+        """build_regulations_from_news의 page_sink. batch_size건마다 한 트랜잭션으로 기록합니다."""
+        key = primary_url(info)
+        if not key or not text:
+            return
+        self._pending.append((key, info.update_or_filed_date, info.article_title, text))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """대기 중인 본문을 기록하고 새로 보관한 건수를 반환합니다 (이미 있는 URL은 건너뜀)."""
+        if not self._pending:
+            return 0
+        rows, self._pending = self._pending, []
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for key, date, title, text in rows:
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO article_text(canonical_url, article_date, title, body) VALUES (?, ?, ?, ?)",
+                    (key, date, title, zlib.compress(text.encode("utf-8"), 6)),
+                )
+                if cur.rowcount:
+                    self.conn.execute(
+                        "INSERT INTO article_fts(rowid, title, body) VALUES (?, ?, ?)", (cur.lastrowid, title, text)
+                    )
+                    added += 1
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        metrics.incr("articles_archived", added)
+        return added
+
+    def text(self, canonical_url: str) -> str | None:
+        row = self.conn.execute("SELECT body FROM article_text WHERE canonical_url = ?", (canonical_url,)).fetchone()
+        return zlib.decompress(row["body"]).decode("utf-8") if row else None
+
+    def search(self, query: str, *, since: str = "", until: str = "", limit: int = 20) -> List[SearchHit]:
+        """BM25 순으로 기사를 찾습니다. FTS5 문법 오류가 나면 단어들을 구문으로 감싸 다시 검색합니다."""
+        try:
+            rows = self._match(query, since, until, limit)
+        except Exception as e:
+            debug_log("FTS query failed (%s), retry as quoted terms: %s", e, query)
+            rows = self._match(_quote_terms(query), since, until, limit)
+        terms = _terms(query)
+        return [
+            SearchHit(
+                canonical_url=r["canonical_url"],
+                article_date=r["article_date"],
+                title=r["title"],
+                rank=round(-r["rank"], 4),
+                snippet=make_snippet(zlib.decompress(r["body"]).decode("utf-8"), terms),
+            )
+            for r in rows
+        ]
+
+    def _match(self, fts_query: str, since: str, until: str, limit: int):
+        # 제목 일치를 본문보다 크게 반영 (bm25 가중치: title 5, body 1)
+        return self.conn.execute(
+            "SELECT t.canonical_url, t.article_date, t.title, t.body, bm25(article_fts, 5.0, 1.0) AS rank "
+            "FROM article_fts JOIN article_text t ON t.id = article_fts.rowid "
+            "WHERE article_fts MATCH ? AND t.article_date >= ? AND t.article_date <= ? "
+            "ORDER BY rank LIMIT ?",
+            (fts_query, since, until or "9999-12-31", limit),
+        ).fetchall()
+
+def _terms(query: str) -> List[str]:
+    words = re.findall(r"\w+", query)
+    return [w for w in words if w not in ("AND", "OR", "NOT", "NEAR")]
+
+def _quote_terms(query: str) -> str:
+    return " ".join('"' + w.replace('"', '""') + '"' for w in _terms(query)) or '""'
+
+def make_snippet(text: str, terms: List[str], width: int = 160) -> str:
+    """첫 번째로 일치한 검색어 주변 width자를 잘라 검색어를 **굵게** 표시합니다."""
+    lower = text.lower()
+    positions = [p for p in (lower.find(t.lower()) for t in terms) if p >= 0]
+    start = max(0, min(positions) - width // 3) if positions else 0
+    snippet = text[start:start + width].replace("\n", " ")
+    for t in sorted(set(terms), key=len, reverse=True):
+        snippet = re.sub(re.escape(t), lambda m: f"**{m.group(0)}**", snippet, flags=re.IGNORECASE)
+    return ("…" if start > 0 else "") + snippet + ("…" if start + width < len(text) else "")
+
+def open_archive(path: str | None = None) -> ArticleArchive | None:
+    """HISTORY_DB에 본문 보관소를 엽니다. 비활성화되어 있거나 FTS5를 쓸 수 없으면 None."""
+    path = history_path() if path is None else path
+    if not path:
+        return None
+    try:
+        return ArticleArchive(path)
+    except Exception as e:
+        metrics.incr("archive_errors")
+        debug_log("Article archive unavailable: %s", e)
+        return None
+
+def main(argv: List[str] | None = None) -> None:
+    # 예: python -m src.search "AI Act penalty" --since 2026-01-01
+    parser = argparse.ArgumentParser(prog="python -m src.search", description="보관된 기사 본문 전문 검색")
+    parser.add_argument("query", help="검색어 (FTS5 문법 사용 가능: \"EU AI Act\", copyright OR 저작권*)")
+    parser.add_argument("--db", default=history_path() or "data/history.db")
+    parser.add_argument("--since", default="", help="YYYY-MM-DD")
+    parser.add_argument("--until", default="", help="YYYY-MM-DD")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    archive = ArticleArchive(args.db)
+    try:
+        hits = archive.search(args.query, since=args.since, until=args.until, limit=args.limit)
+    finally:
+        archive.close()
+    for h in hits:
+        print(f"{h.article_date}  {h.rank:7.3f}  {h.title[:90]}\n    {h.canonical_url}\n    {h.snippet}\n")
+    if not hits:
+        print("검색 결과가 없습니다.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import argparse
+import multiprocessing
+import os
+import socket
+import time
+from datetime import datetime, timezone, timedelta
+from typing import List, Sequence
+
+from . import content, hosthealth, metrics
+from .extract import RegulationInfo, analyze_item, fetch_article_text, load_known_cases, merge_regulations
+from .fetch import NewsItem, active_locales, feed_matrix, fetch_query
+from .queries import NEWS_QUERIES
+from .search import open_archive
+from .utils import canonical_url, debug_log
+from .workqueue import WorkQueue
+
+# 분산 실행: 코디네이터가 NEWS_QUERIES x 에디션을 query 작업으로 큐에 넣으면,
+# 워커들이 피드를 가져와 기사마다(정규화 URL 기준 한 번) article 작업을 추가하고, 기사 본문을 분석해 결과를 기록합니다.
+# 마지막으로 코디네이터가 결과를 모아 merge_regulations로 RegulationInfo 목록을 만듭니다.
+
+DEFAULT_QUEUE_DB = "data/workqueue.db"
+
+def _item_to_payload(item: NewsItem) -> dict:
+    return {
+        "title": item.title,
+        "url": item.url,
+        "published_at": item.published_at.isoformat() if item.published_at else None,
+        "source": item.source,
+        "locale": item.locale,
+        "summary": item.summary,
+        "source_url": item.source_url,
+    }
+
+def _item_from_payload(p: dict) -> NewsItem:
+    published = datetime.fromisoformat(p["published_at"]) if p.get("published_at") else None
+    return NewsItem(
+        title=p["title"], url=p["url"], published_at=published, source=p.get("source", ""),
+        locale=p.get("locale", ""), summary=p.get("summary", ""), source_url=p.get("source_url", ""),
+    )
+
+def process_task(queue: WorkQueue, task, known, cutoff: datetime, archive=None) -> None:
+    if task.kind == "query":
+        items = fetch_query(task.payload["query"], task.payload.get("locale", "en-US"))
+        added = 0
+        for item in items:
+            if queue.enqueue("article", canonical_url(item.url), _item_to_payload(item)):
+                added += 1
+        queue.complete(task, {"entries": len(items), "new_articles": added})
+        return
+
+    if task.kind == "article":
+        item = _item_from_payload(task.payload)
+        if item.published_at and item.published_at < cutoff:
+            queue.complete(task, None)
+            return
+        metrics.incr("in_window")
+        text, final_url, fallback = fetch_article_text(item)
+        info = analyze_item(item, text, final_url, known) if text else None
+        if info is not None and archive is not None and not fallback:
+            archive.add(info, text)
+        queue.complete(task, info.__dict__ if info else None)
+        return
+
+    raise ValueError(f"unknown task kind: {task.kind}")
+
+def worker_main(db_path: str, worker_id: str, lookback_days: int, archive: bool = False, report_metrics: bool = True) -> int:
+    """
+    큐가 빌 때까지 작업을 처리합니다. 처리한 작업 수를 반환합니다.
+    report_metrics=True면 종료 시 이 프로세스의 카운터를 큐에 기록해 코디네이터가 합산하게 합니다.
+    """
+    queue = WorkQueue(db_path)
+    # 본문 보관소는 워커마다 따로 열고, 워커 종료 시 남은 배치를 기록
+    store = open_archive() if archive else None
+    known = load_known_cases()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    processed = 0
+    try:
+        while True:
+            task = queue.claim(worker_id)
+            if task is None:
+                if queue.unfinished() == 0:
+                    break
+                # 다른 워커가 처리 중인 query 작업에서 article 작업이 더 생기거나,
+                # 죽은 워커의 lease가 만료되어 다시 가져올 수 있을 때까지 대기
+                time.sleep(0.2)
+                continue
+            try:
+                process_task(queue, task, known, cutoff, store)
+                processed += 1
+            except Exception as e:
+                debug_log("[%s] task %s:%s failed (attempt %d): %s", worker_id, task.kind, task.key, task.attempts, e)
+                queue.fail(task, str(e))
+    finally:
+        if store is not None:
+            store.close()
+        hosthealth.save()
+        content.save_profiles()
+        if report_metrics:
+            queue.report_metrics(worker_id, metrics.dump())
+        queue.close()
+    debug_log("[%s] processed %d tasks", worker_id, processed)
+    return processed
+
+def run_sharded(
+    lookback_days: int,
+    workers: int,
+    db_path: str = DEFAULT_QUEUE_DB,
+    archive: bool = False,
+    items: Sequence[NewsItem] = (),
+) -> List[RegulationInfo]:
+    """
+    코디네이터: 큐를 초기화하고 워커 프로세스 N개로 수집/분석한 뒤 결과를 병합합니다.
+    items(이전 실행에서 이월된 기사 등)는 피드 수집 없이 article 작업으로 먼저 넣습니다.
+    """
+    queue = WorkQueue(db_path)
+    queue.reset()
+    for item in items:
+        queue.enqueue("article", canonical_url(item.url), _item_to_payload(item))
+    # 피드 URL이 같은 조합(NEWS_RSS_URL에 에디션 자리표시자가 없는 경우 등)은 작업 하나로 묶음
+    for url, (q, locale) in feed_matrix(NEWS_QUERIES, active_locales()).items():
+        queue.enqueue("query", url, {"query": q, "locale": locale})
+
+    ctx = multiprocessing.get_context("spawn")
+    host = socket.gethostname()
+    procs = [
+        ctx.Process(target=worker_main, args=(db_path, f"{host}-{os.getpid()}-w{i}", lookback_days, archive), daemon=True)
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    # 워커가 비정상 종료하여 남은 작업이 있으면 코디네이터가 직접 마무리
+    if queue.unfinished() > 0:
+        debug_log("Workers exited with unfinished tasks %s; draining in coordinator", queue.counts())
+        worker_main(db_path, f"{host}-{os.getpid()}-coordinator", lookback_days, archive, report_metrics=False)
+
+    # 워커 프로세스의 카운터/지연 시간을 코디네이터 요약(run_summary.json 등)에 합산
+    for data in queue.worker_metrics():
+        metrics.merge(data)
+    queue.expire_leases()
+    counts = queue.counts()
+    debug_log("Sharded run finished: %s", counts)
+    for f in queue.failed():
+        debug_log("Failed task %s:%s after %d attempts: %s", f["kind"], f["key"], f["attempts"], f["last_error"])
+    metrics.incr("tasks_done", counts.get("done", 0))
+    metrics.incr("tasks_failed", counts.get("failed", 0))
+
+    results = [RegulationInfo(**payload) for payload in queue.results("article") if payload]
+    queue.close()
+    return merge_regulations(results)
+
+def main(argv: List[str] | None = None) -> None:
+    # 같은 호스트의 다른 프로세스에서 기존 큐에 워커로 참여: python -m src.shard --queue-db data/workqueue.db
+    # (큐는 WAL 모드라 네트워크 파일시스템으로 다른 노드와 공유할 수 없음)
+    parser = argparse.ArgumentParser(prog="python -m src.shard", description="작업 큐 워커")
+    parser.add_argument("--queue-db", default=os.environ.get("QUEUE_DB", DEFAULT_QUEUE_DB))
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--no-archive", action="store_true", help="기사 본문을 검색용으로 보관하지 않음")
+    args = parser.parse_args(argv)
+    worker_main(args.queue_db, args.worker_id, int(os.environ.get("LOOKBACK_DAYS", "3")), archive=not args.no_archive)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,22 @@
 from __future__ import annotations
-import requests
+from . import metrics
+from .utils import get_session
+
+class SlackRateLimited(Exception):
+    """Slack이 429로 응답한 경우. retry_after초 뒤에 다시 보내야 합니다."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Slack rate limited, retry after {retry_after:g}s")
+        self.retry_after = retry_after
 
 def post_to_slack(webhook_url: str, text: str) -> None:
-    r = requests.post(webhook_url, json={"text": text}, timeout=20)
+    r = get_session().post(webhook_url, json={"text": text}, timeout=20)
+    metrics.incr("slack_posts")
+    if r.status_code == 429:
+        metrics.incr("slack_rate_limited")
+        try:
+            retry_after = float(r.headers.get("Retry-After") or 1)
+        except ValueError:
+            retry_after = 1.0
+        raise SlackRateLimited(retry_after)
     r.raise_for_status()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable, List, Sequence, TYPE_CHECKING
+
+from . import metrics
+from .extract import RegulationInfo
+from .notify import Route
+from .render import bands_at_least
+from .utils import debug_log
+
+if TYPE_CHECKING:
+    from .run import Settings
+
+# 한 번의 실행에서 여러 리포트 대상(팀별 저장소/라벨/Slack 채널/국가·강도 필터)으로 게시합니다.
+# 수집/분석은 한 번만 하고, 대상마다 필터 -> 렌더링 -> 중복 제거(대상 이슈의 이전 댓글 기준) -> 게시를 병렬로 수행합니다.
+
+DEFAULT_TARGETS_FILE = "data/targets.yml"
+
+@dataclass
+class Target:
+    name: str
+    settings: "Settings"
+    countries: tuple[str, ...] = ()
+    subjects: tuple[str, ...] = ()
+    min_score: int = 0
+
+    def select(self, regulations: Sequence[RegulationInfo]) -> List[RegulationInfo]:
+        """대상 필터(국가/규제명/강도)에 맞는 항목. 조건은 Slack 라우트와 같은 방식으로 적용합니다."""
+        f = Route(self.name, "", self.countries, self.subjects, self.min_score)
+        return [r for r in regulations if f.matches(r)] if f.is_filtered else list(regulations)
+
+    @property
+    def trend_scope(self) -> dict:
+        """Slack 추세 요약의 집계 범위 (history.trend_lines 인자). 대상의 국가/규제명/강도 필터를 그대로 씁니다."""
+        return {"countries": self.countries, "subjects": self.subjects, "bands": bands_at_least(self.min_score)}
+
+    @property
+    def routes(self) -> List[Route]:
+        """대상의 Slack 채널 하나 (webhook이 없으면 Slack 전송 안 함)."""
+        return [Route(name=self.name, webhook=self.settings.slack_webhook)] if self.settings.slack_webhook else []
+
+def targets_path() -> str:
+    """TARGETS_FILE(기본 data/targets.yml)이 있으면 그 경로, 없으면 빈 문자열 (단일 대상 실행)."""
+    path = os.environ.get("TARGETS_FILE", DEFAULT_TARGETS_FILE)
+    return path if path and os.path.exists(path) else ""
+
+def _env(name: str | None) -> str:
+    return os.environ.get(name, "") if name else ""
+
+def load_targets(base: "Settings", path: str, require_credentials: bool = True) -> List[Target]:
+    """
+    대상 목록을 읽습니다. 항목: name, owner, repo, token_env, label, title, slack_webhook 또는 slack_webhook_env,
+    countries, subjects, min_score. 저장소/토큰/라벨/제목은 생략하면 환경 변수 설정을 따르고, Slack은 지정한 대상만 보냅니다.
+    """
+    import yaml
+    with open(path, "r", encoding="utf-8") as f:
+        entries = yaml.safe_load(f) or []
+    targets: List[Target] = []
+    missing: List[str] = []
+    issues: dict = {}
+    for i, e in enumerate(entries):
+        name = str(e.get("name") or f"target{i}")
+        settings = replace(
+            base,
+            owner=e.get("owner") or base.owner,
+            repo=e.get("repo") or base.repo,
+            gh_token=_env(e.get("token_env")) or base.gh_token,
+            slack_webhook=e.get("slack_webhook") or _env(e.get("slack_webhook_env")),
+            base_title=e.get("title") or base.base_title,
+            issue_label=e.get("label") or base.issue_label,
+        )
+        if require_credentials and not all([settings.owner, settings.repo, settings.gh_token]):
+            missing.append(name)
+        # 같은 이슈를 두 대상이 동시에 만들거나 닫지 않도록
+        key = (settings.owner, settings.repo, settings.issue_label, settings.base_title)
+        if key in issues:
+            raise ValueError(f"대상 {issues[key]}, {name}이 같은 이슈(저장소/라벨/제목)를 사용합니다")
+        issues[key] = name
+        targets.append(Target(
+            name=name,
+            settings=settings,
+            countries=tuple(e.get("countries") or ()),
+            subjects=tuple(e.get("subjects") or ()),
+            min_score=int(e.get("min_score") or 0),
+        ))
+    if missing:
+        raise ValueError(f"GitHub 설정(owner/repo/token)이 누락된 대상: {', '.join(missing)}")
+    return targets
+
+def publish_targets(
+    targets: Sequence[Target],
+    regulations: Sequence[RegulationInfo],
+    publish: Callable[..., None],
+    max_workers: int | None = None,
+) -> List[str]:
+    """대상별 게시를 병렬(TARGET_CONCURRENCY, 기본 4)로 수행하고, 실패한 대상 이름을 반환합니다."""
+    if not targets:
+        return []
+    if max_workers is None:
+        max_workers = int(os.environ.get("TARGET_CONCURRENCY", "4"))
+
+    def one(target: Target) -> None:
+        publish(target.settings, target.select(regulations), routes=target.routes, trend_scope=target.trend_scope)
+
+    failed: List[str] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as pool:
+        futures = [(t, pool.submit(one, t)) for t in targets]
+        for target, fut in futures:
+            try:
+                fut.result()
+                metrics.incr("targets_published")
+            except Exception as e:
+                metrics.incr("target_errors")
+                debug_log("Target %s publish failed: %s", target.name, e)
+                failed.append(target.name)
+    return failed
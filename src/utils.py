@@ -1,9 +1,73 @@
+from __future__ import annotations
 import os
 import re
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-def debug_log(msg: str):
+if TYPE_CHECKING:
+    import requests
+    import sqlite3
+
+_SESSION: "requests.Session | None" = None
+
+# 매 호출마다 os.environ을 조회하지 않도록 시작 시 한 번만 읽습니다.
+_DEBUG = os.environ.get("DEBUG") == "1"
+
+def set_debug(enabled: bool | None = None) -> None:
+    """디버그 출력 여부를 바꿉니다. None이면 DEBUG 환경 변수를 다시 읽습니다."""
+    global _DEBUG
+    _DEBUG = (os.environ.get("DEBUG") == "1") if enabled is None else enabled
+
+def is_debug() -> bool:
+    return _DEBUG
+
+def debug_log(msg: str, *args):
     """
     DEBUG 환경 변수가 '1'일 때만 메세지를 출력합니다.
+    args가 주어지면 출력할 때만 `msg % args`로 포맷합니다.
+    """
+    if _DEBUG:
+        print(f"[DEBUG] {msg % args if args else msg}")
+
+def get_session() -> requests.Session:
+    """
+    프로세스 전체에서 공유하는 HTTP 세션을 반환합니다.
+    (데몬 모드에서 커넥션 풀을 재사용하기 위함)
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        _SESSION = requests.Session()
+        _SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+    return _SESSION
+
+# 같은 기사를 가리키는 URL끼리 비교할 때 무시하는 파라미터 (에디션/추적용)
+_IGNORED_PARAMS = {"hl", "gl", "ceid", "oc", "fbclid", "gclid", "cmpid", "ref"}
+
+def canonical_url(url: str) -> str:
+    """
+    비교용 정규화 URL을 반환합니다.
+    스킴/호스트 소문자화, fragment와 추적 파라미터(utm_*, Google News 에디션 파라미터 등) 제거,
+    나머지 쿼리 파라미터 정렬, 경로 끝의 '/' 제거.
+    """
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _IGNORED_PARAMS
+    )
+    path = parts.path.rstrip("/") if len(parts.path) > 1 else parts.path
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+def open_sqlite(path: str) -> "sqlite3.Connection":
+    """
+    로컬 SQLite 파일을 엽니다. 여러 프로세스가 동시에 쓰는 경우를 위해 WAL 모드와 busy timeout을 설정합니다.
     """
-    if os.environ.get("DEBUG") == "1":
-        print(f"[DEBUG] {msg}")
+    import sqlite3
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
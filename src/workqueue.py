@@ -0,0 +1,168 @@
+from __future__ import annotations
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Iterator, List
+
+from .utils import open_sqlite
+
+# SQLite 기반 로컬 작업 큐.
+# - enqueue는 (kind, key) 기준으로 멱등 (같은 기사 URL이 여러 쿼리에서 나와도 작업은 하나)
+# - claim은 lease를 잡고, lease가 만료된 작업은 다른 워커가 다시 가져갈 수 있음
+# - 결과는 (kind, key) 기준 INSERT OR REPLACE 이므로 재시도/중복 실행에도 한 번만 남음
+# - WAL 모드(공유 메모리)를 사용하므로 같은 호스트의 프로세스끼리만 큐 파일을 공유할 수 있습니다 (NFS 등 네트워크 파일시스템 불가)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_until REAL,
+    last_error TEXT,
+    UNIQUE(kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, lease_until);
+CREATE TABLE IF NOT EXISTS worker_metrics (
+    worker TEXT PRIMARY KEY,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT,
+    PRIMARY KEY (kind, key)
+);
+"""
+
+@dataclass
+class Task:
+    id: int
+    kind: str
+    key: str
+    payload: dict
+    attempts: int
+    lease_owner: str
+
+class WorkQueue:
+    def __init__(self, path: str, lease_seconds: float = 120, max_attempts: int = 3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.conn = open_sqlite(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def reset(self) -> None:
+        """이전 실행의 작업/결과를 모두 지웁니다 (코디네이터가 새 실행을 시작할 때)."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        self.conn.execute("DELETE FROM tasks")
+        self.conn.execute("DELETE FROM results")
+        self.conn.execute("DELETE FROM worker_metrics")
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, kind: str, key: str, payload: dict) -> bool:
+        """작업을 추가합니다. 이미 같은 (kind, key)가 있으면 무시하고 False."""
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO tasks(kind, key, payload) VALUES (?, ?, ?)",
+            (kind, key, json.dumps(payload, ensure_ascii=False)),
+        )
+        return cur.rowcount > 0
+
+    def claim(self, worker: str, now: float | None = None) -> Task | None:
+        """대기 중이거나 lease가 만료된 작업 하나를 lease 잡아 반환합니다."""
+        now = time.time() if now is None else now
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire_leases(now)
+            row = self.conn.execute(
+                "SELECT * FROM tasks WHERE (status = 'pending' OR (status = 'leased' AND lease_until < ?)) "
+                "AND attempts < ? ORDER BY id LIMIT 1",
+                (now, self.max_attempts),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, now + self.lease_seconds, row["id"]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return Task(row["id"], row["kind"], row["key"], json.loads(row["payload"]), row["attempts"] + 1, worker)
+
+    def _expire_leases(self, now: float) -> int:
+        """시도 횟수를 다 쓴 작업의 lease가 만료되면 (워커가 죽은 경우) failed로 둡니다."""
+        cur = self.conn.execute(
+            "UPDATE tasks SET status = 'failed', lease_owner = NULL, lease_until = NULL, "
+            "last_error = COALESCE(last_error, 'lease expired') "
+            "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, self.max_attempts),
+        )
+        return cur.rowcount
+
+    def expire_leases(self, now: float | None = None) -> int:
+        return self._expire_leases(time.time() if now is None else now)
+
+    def complete(self, task: Task, result: Any = None) -> None:
+        """결과를 기록하고 작업을 완료 처리합니다 (결과 기록은 멱등)."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results(kind, key, payload) VALUES (?, ?, ?)",
+                (task.kind, task.key, json.dumps(result, ensure_ascii=False)),
+            )
+            self.conn.execute(
+                "UPDATE tasks SET status = 'done', lease_owner = NULL, lease_until = NULL WHERE id = ?",
+                (task.id,),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def fail(self, task: Task, error: str) -> None:
+        """실패한 작업을 재시도 대기로 돌리거나, 시도 횟수를 넘기면 failed로 둡니다."""
+        status = "failed" if task.attempts >= self.max_attempts else "pending"
+        self.conn.execute(
+            "UPDATE tasks SET status = ?, lease_owner = NULL, lease_until = NULL, last_error = ? "
+            "WHERE id = ? AND lease_owner = ?",
+            (status, error[:500], task.id, task.lease_owner),
+        )
+
+    def unfinished(self, now: float | None = None) -> int:
+        """아직 끝나지 않았고 재시도 가능한 작업 수."""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased') AND attempts < ? "
+            "OR (status = 'leased' AND lease_until >= ?)",
+            (self.max_attempts, time.time() if now is None else now),
+        ).fetchone()
+        return int(row[0])
+
+    def report_metrics(self, worker: str, data: dict) -> None:
+        """워커 프로세스의 metrics.dump()를 기록합니다 (코디네이터가 모아 합산)."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO worker_metrics(worker, payload) VALUES (?, ?)",
+            (worker, json.dumps(data)),
+        )
+
+    def worker_metrics(self) -> List[dict]:
+        return [json.loads(r["payload"]) for r in self.conn.execute("SELECT payload FROM worker_metrics ORDER BY worker")]
+
+    def counts(self) -> dict:
+        return {r["status"]: r["n"] for r in self.conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status")}
+
+    def results(self, kind: str) -> Iterator[Any]:
+        for row in self.conn.execute("SELECT payload FROM results WHERE kind = ? ORDER BY key", (kind,)):
+            yield json.loads(row["payload"]) if row["payload"] is not None else None
+
+    def failed(self) -> List[dict]:
+        rows = self.conn.execute("SELECT kind, key, attempts, last_error FROM tasks WHERE status = 'failed'")
+        return [dict(r) for r in rows]
@@ -0,0 +1,196 @@
+"""
+오프라인 벤치마크.
+
+네트워크 없이 로컬 stand-in 서버(standins.py)로 녹화된 형식의 RSS/기사 HTML과
+가짜 GitHub/Slack을 제공하고, 주요 단계의 처리량과 최대 메모리를 측정합니다.
+
+    python test/bench/bench.py --scales 100,1000,10000 --comments 0,1000 --output bench.json
+    python test/bench/bench.py --scales 100 --compare bench.json   # 이전 결과와 비교
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from standins import StandInServer, article_title  # noqa: E402
+
+def _synthetic_comments(n_comments: int, rows_per_comment: int, url_base: str) -> List[dict]:
+    """render_markdown 형식의 과거 리포트 댓글을 합성합니다 (절반은 현재 기사와 URL이 겹침)."""
+    from src.extract import RegulationInfo
+    from src.render import render_markdown
+
+    comments = []
+    for c in range(n_comments):
+        regs = []
+        for r in range(rows_per_comment):
+            aid = (c * rows_per_comment + r) * 2  # 짝수 id만 사용 -> 현재 기사와 일부 중복
+            regs.append(RegulationInfo(
+                update_or_filed_date="2026-01-01",
+                country="EU",
+                case_title="EU AI Act",
+                article_title=article_title(aid),
+                case_number="N/A",
+                reason="EU AI Act 관련 정보.",
+                article_urls=[f"{url_base}/articles/{aid}"],
+                matched_keywords="act, regulation",
+            ))
+        comments.append({"id": c + 1, "body": render_markdown(regs)})
+    return comments
+
+def measure(stage: str, fn: Callable[[], object], count: Callable[[object], int], memory: bool = True) -> dict:
+    """fn을 한 번 실행해 시간을, (memory=True면) tracemalloc 아래에서 한 번 더 실행해 최대 메모리를 잽니다."""
+    gc.collect()
+    t0 = time.perf_counter()
+    out = fn()
+    seconds = time.perf_counter() - t0
+    n = count(out)
+    result = {
+        "stage": stage,
+        "items": n,
+        "seconds": round(seconds, 4),
+        "items_per_sec": round(n / seconds, 1) if seconds > 0 else None,
+    }
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / 1_000_000, 2)
+    return result
+
+def run_scale(n_articles: int, n_comments: int, rows_per_comment: int = 20, memory: bool = True) -> List[dict]:
+    from src import content, fetch, hosthealth
+    from src.queries import NEWS_QUERIES
+
+    server = StandInServer(NEWS_QUERIES, n_articles)
+    server.seed_comments = _synthetic_comments(n_comments, rows_per_comment, server.base_url)
+    results: List[dict] = []
+    # 벤치마크가 저장소의 data/*.db를 건드리지 않도록 로컬 상태 파일은 임시 디렉터리로
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    env = {"GITHUB_API_URL": server.base_url, "OUTBOX_DB": os.path.join(tmp, "outbox.db"), "HISTORY_DB": "",
+           "HOST_HEALTH_DB": os.path.join(tmp, "host_health.db"), "SITE_PROFILES": os.path.join(tmp, "site_profiles.json")}
+    saved_rss, saved_env = fetch.GOOGLE_NEWS_RSS, {k: os.environ.get(k) for k in env}
+    with server:
+        fetch.GOOGLE_NEWS_RSS = server.rss_template
+        os.environ.update(env)
+        hosthealth.reset()
+        content.reset_profiles()
+        try:
+            _run_stages(server, results, memory)
+        finally:
+            fetch.GOOGLE_NEWS_RSS = saved_rss
+            for k, v in saved_env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+            hosthealth.reset()
+            content.reset_profiles()
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    for r in results:
+        r["scale"] = n_articles
+        r["comments"] = n_comments
+    return results
+
+def _run_stages(server: StandInServer, results: List[dict], memory: bool) -> None:
+    from src import fetch, extract, notify, run
+    from src.dedup import apply_deduplication
+    from src.render import render_markdown
+
+    def do_fetch():
+        fetch._FEED_CACHE.clear()
+        return fetch.fetch_news()
+
+    def do_extract():
+        extract._PAGE_CACHE.clear()
+        return extract.build_regulations_from_news(news, [], lookback_days=3)
+
+    results.append(measure("fetch_news", do_fetch, len, memory))
+    news = do_fetch()
+    results.append(measure("build_regulations_from_news", do_extract, len, memory))
+    regulations = do_extract()
+    results.append(measure("render_markdown", lambda: render_markdown(regulations), lambda _: len(regulations), memory))
+    md = render_markdown(regulations)
+    results.append(measure("apply_deduplication", lambda: apply_deduplication(md, server.seed_comments), lambda _: len(regulations), memory))
+
+    settings = run.Settings(owner="bench", repo="bench", gh_token="x", slack_webhook=server.slack_url)
+    before = server.request_count
+
+    def do_publish():
+        run.publish(settings, regulations)
+        notify.shutdown()  # run.main 종료 시와 같이 Slack 전송까지 포함
+
+    results.append(measure("publish", do_publish, lambda _: len(regulations), memory=False))
+    results[-1]["http_requests"] = server.request_count - before
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except Exception:
+        return ""
+
+def compare(old: dict, new: dict) -> str:
+    """이전 결과 대비 단계별 소요 시간/메모리 변화율 표."""
+    key = lambda r: (r["stage"], r["scale"], r["comments"])
+    before = {key(r): r for r in old.get("results", [])}
+    lines = [f"{'stage':32} {'scale':>7} {'cmts':>5} {'sec(old)':>9} {'sec(new)':>9} {'Δ%':>7} {'MB(new)':>8}"]
+    for r in new["results"]:
+        o = before.get(key(r))
+        if not o:
+            continue
+        delta = (r["seconds"] - o["seconds"]) / o["seconds"] * 100 if o["seconds"] else 0.0
+        lines.append(f"{r['stage']:32} {r['scale']:>7} {r['comments']:>5} {o['seconds']:>9.4f} {r['seconds']:>9.4f} {delta:>+7.1f} {r.get('peak_mb', ''):>8}")
+    return "\n".join(lines)
+
+def main(argv: List[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="ai-regulation-tracker 오프라인 벤치마크")
+    parser.add_argument("--scales", default="100,1000", help="기사 수 목록 (예: 100,1000,10000,100000)")
+    parser.add_argument("--comments", default="0,100", help="기존 이슈 댓글 수 목록 (예: 0,1000,5000)")
+    parser.add_argument("--rows-per-comment", type=int, default=20)
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 측정 생략 (시간만)")
+    parser.add_argument("--output", default="", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", default="", help="비교할 이전 결과 JSON")
+    args = parser.parse_args(argv)
+
+    from src.utils import set_debug
+    set_debug(False)
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "results": [],
+    }
+    for scale in [int(x) for x in args.scales.split(",") if x]:
+        for n_comments in [int(x) for x in args.comments.split(",") if x]:
+            rows = run_scale(scale, n_comments, args.rows_per_comment, memory=not args.no_memory)
+            report["results"].extend(rows)
+            for r in rows:
+                print(f"{r['stage']:32} scale={scale:<7} comments={n_comments:<5} {r['seconds']:>9.4f}s "
+                      f"{r['items_per_sec'] or 0:>10.1f}/s  peak={r.get('peak_mb', '-')}MB")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            print(compare(json.load(f), report))
+    return report
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+벤치마크/오프라인 테스트용 로컬 stand-in 서버.
+
+하나의 ThreadingHTTPServer가 다음 엔드포인트를 흉내냅니다.
+- Google News RSS : GET /rss/search?q=...        (fixtures/google_news_*.xml 기반 합성 피드)
+- 기사 페이지      : GET /articles/<id>           (fixtures/article.html 기반)
+- GitHub Issues   : GET/POST /repos/<o>/<r>/issues, PATCH /repos/<o>/<r>/issues/<n>,
+                    GET/POST /repos/<o>/<r>/issues/<n>/comments
+- Slack Webhook   : POST /slack
+"""
+from __future__ import annotations
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+COUNTRY_PHRASES = ["European Union", "United States", "South Korea", "Japan", "United Kingdom", "Germany", "Canada", "India"]
+SOURCES = [("Reuters", "www.reuters.com"), ("The Verge", "www.theverge.com"), ("연합뉴스", "www.yna.co.kr"), ("Politico", "www.politico.eu")]
+FILLER = "Analysts expect further consultations before the text is finalised. " * 8
+
+def _read(name: str) -> str:
+    with open(os.path.join(FIXTURES, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def _fill(template: str, **values: str) -> str:
+    # 픽스처 HTML에 CSS/JS 중괄호가 있어 str.format 대신 단순 치환을 사용
+    for k, v in values.items():
+        template = template.replace("{" + k + "}", v)
+    return template
+
+def article_title(article_id: int) -> str:
+    country = COUNTRY_PHRASES[article_id % len(COUNTRY_PHRASES)]
+    return f"{country} advances AI regulation bill #{article_id}"
+
+class StandInServer:
+    """
+    n_articles개의 기사를 queries에 고르게 나누어 제공하고,
+    새로 만들어지는 GitHub 이슈마다 seed_comments를 미리 채워 둡니다.
+    """
+
+    def __init__(self, queries: List[str], n_articles: int, seed_comments: List[dict] | None = None, article_delay: float = 0.0):
+        self.queries = list(queries)
+        self.n_articles = n_articles
+        # 기사 응답 지연(초). 실제 언론사 응답 시간을 흉내낼 때 사용
+        self.article_delay = article_delay
+        self.seed_comments = list(seed_comments or [])
+        self.issues: List[dict] = []
+        self.comments: Dict[int, List[dict]] = {}
+        self.slack_messages: List[str] = []
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, bytes] = {}
+        self._article_tpl = _read("article.html")
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._build_feeds()
+
+    # ------------------------------------------------------------------
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def rss_template(self) -> str:
+        return self.base_url + "/rss/search?q={q}"
+
+    @property
+    def slack_url(self) -> str:
+        return self.base_url + "/slack"
+
+    def start(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    def _build_feeds(self) -> None:
+        channel_tpl = _read("google_news_rss.xml")
+        item_tpl = _read("google_news_item.xml").strip()
+        now = datetime.now(timezone.utc)
+        per_query = max(1, -(-self.n_articles // max(1, len(self.queries))))
+        for qi, q in enumerate(self.queries):
+            start = qi * per_query
+            end = min(self.n_articles, start + per_query)
+            items = []
+            for aid in range(start, end):
+                source, host = SOURCES[aid % len(SOURCES)]
+                items.append(_fill(
+                    item_tpl,
+                    title=escape(article_title(aid)),
+                    source=escape(source),
+                    source_host=host,
+                    link=f"{self.base_url}/articles/{aid}",
+                    guid=f"CBMi{aid:08d}",
+                    pub_date=format_datetime(now - timedelta(minutes=aid % 2880)),
+                ))
+            body = _fill(channel_tpl, last_build=format_datetime(now), items="\n".join(items))
+            self._feeds[q] = body.encode("utf-8")
+
+    def article_html(self, article_id: int) -> bytes:
+        source, _ = SOURCES[article_id % len(SOURCES)]
+        return _fill(
+            self._article_tpl,
+            title=article_title(article_id),
+            source=source,
+            country_phrase=COUNTRY_PHRASES[article_id % len(COUNTRY_PHRASES)],
+            pub_date=datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+            filler=FILLER,
+        ).encode("utf-8")
+
+    # ------------------------------------------------------------------
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 헤더/본문 분할 전송 시 Nagle + delayed ACK로 요청당 ~40ms 지연이 생기는 것을 방지
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args) -> None:  # 조용히
+                pass
+
+            def _send(self, status: int, body: bytes, ctype: str = "application/json") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status: int, obj) -> None:
+                self._send(status, json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+            def _body(self) -> dict:
+                n = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(n) if n else b""
+                return json.loads(raw or b"{}")
+
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.request_count += 1
+                u = urlparse(self.path)
+                parts = [p for p in u.path.split("/") if p]
+                if u.path == "/rss/search":
+                    q = parse_qs(u.query).get("q", [""])[0]
+                    body = server._feeds.get(q)
+                    if body is None:
+                        return self._send(404, b"unknown query", "text/plain")
+                    return self._send(200, body, "application/rss+xml; charset=utf-8")
+                if len(parts) == 2 and parts[0] == "articles":
+                    if server.article_delay:
+                        time.sleep(server.article_delay)
+                    return self._send(200, server.article_html(int(parts[1])), "text/html; charset=utf-8")
+                if len(parts) == 4 and parts[0] == "repos" and parts[3] == "issues":
+                    with server._lock:
+                        return self._json(200, [i for i in server.issues if i["state"] == "open"])
+                if len(parts) == 6 and parts[0] == "repos" and parts[5] == "comments":
+                    with server._lock:
+                        return self._json(200, server.comments.get(int(parts[4]), []))
+                self._send(404, b"{}")
+
+            def do_POST(self) -> None:
+                with server._lock:
+                    server.request_count += 1
+                u = urlparse(self.path)
+                parts = [p for p in u.path.split("/") if p]
+                payload = self._body()
+                if u.path == "/slack":
+                    with server._lock:
+                        server.slack_messages.append(payload.get("text", ""))
+                    return self._send(200, b"ok", "text/plain")
+                if len(parts) == 4 and parts[0] == "repos" and parts[3] == "issues":
+                    with server._lock:
+                        number = len(server.issues) + 1
+                        issue = {"number": number, "title": payload.get("title", ""), "state": "open"}
+                        server.issues.append(issue)
+                        server.comments[number] = list(server.seed_comments)
+                    return self._json(201, issue)
+                if len(parts) == 6 and parts[0] == "repos" and parts[5] == "comments":
+                    with server._lock:
+                        bucket = server.comments.setdefault(int(parts[4]), [])
+                        comment = {"id": len(bucket) + 1, "body": payload.get("body", "")}
+                        bucket.append(comment)
+                    return self._json(201, comment)
+                self._send(404, b"{}")
+
+            def do_PATCH(self) -> None:
+                u = urlparse(self.path)
+                parts = [p for p in u.path.split("/") if p]
+                payload = self._body()
+                if len(parts) == 5 and parts[0] == "repos" and parts[3] == "issues":
+                    with server._lock:
+                        for issue in server.issues:
+                            if issue["number"] == int(parts[4]):
+                                issue.update(payload)
+                                return self._json(200, issue)
+                self._send(404, b"{}")
+
+        return Handler
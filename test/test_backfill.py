@@ -0,0 +1,77 @@
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+from standins import StandInServer, article_title
+from src import backfill, content, hosthealth
+from src.fetch import NewsItem
+from src.history import HistoryStore
+from src.queries import NEWS_QUERIES
+
+def test_date_slices_cover_range_once():
+    slices = list(backfill.date_slices(date(2026, 3, 1), date(2026, 3, 10), 4))
+    assert slices == [
+        (date(2026, 3, 1), date(2026, 3, 5)),
+        (date(2026, 3, 5), date(2026, 3, 9)),
+        (date(2026, 3, 9), date(2026, 3, 11)),
+    ]
+    windowed = backfill.windowed_queries(NEWS_QUERIES, date(2026, 3, 1), date(2026, 3, 5))
+    assert len(windowed) == len(NEWS_QUERIES)
+    for q in windowed:
+        # 상대 기간(when:3d)이 남아 있으면 Google News가 최근 며칠로 제한함
+        assert "when:" not in q and q.endswith(") after:2026-02-28 before:2026-03-05")
+
+class _Interrupted(Exception):
+    pass
+
+def test_backfill_checkpoints_and_resumes(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOST_HEALTH_DB", "")
+    monkeypatch.setenv("SITE_PROFILES", "")
+    hosthealth.reset()
+    content.reset_profiles()
+    db = str(tmp_path / "history.db")
+    state = str(tmp_path / "backfill_state.json")
+    calls = []
+
+    with StandInServer(["q"], 0) as server:
+        def fetch(queries, locales, fail_after=None):
+            assert len(queries) == len(NEWS_QUERIES) and not any("when:" in q for q in queries)
+            calls.append(queries[0])
+            if fail_after is not None and len(calls) > fail_after:
+                raise _Interrupted()
+            since = date.fromisoformat(queries[0].split("after:")[1][:10]) + timedelta(days=1)
+            aid = since.day
+            day = datetime(since.year, since.month, since.day, 12, tzinfo=timezone.utc)
+            return [
+                NewsItem(title=article_title(aid), url=f"{server.base_url}/articles/{aid}", published_at=day, source="Reuters"),
+                # 연산자 경계 밖 기사는 게시 시각으로 걸러짐
+                NewsItem(title=article_title(100 + aid), url=f"{server.base_url}/articles/{100 + aid}", published_at=day - timedelta(days=10), source="Reuters"),
+            ]
+
+        run = dict(slice_days=4, state_path=state, history_db=db, locales=["en-US"])
+        with pytest.raises(_Interrupted):
+            backfill.run_backfill(date(2026, 3, 1), date(2026, 3, 10), fetch=lambda q, l: fetch(q, l, fail_after=1), **run)
+        assert backfill.load_state(state)["next"] == "2026-03-05"
+
+        calls.clear()
+        assert backfill.run_backfill(date(2026, 3, 1), date(2026, 3, 10), fetch=fetch, **run) == 2
+        assert calls[0].endswith(" after:2026-03-04 before:2026-03-09")
+        assert backfill.load_state(state)["recorded"] == 3
+
+        calls.clear()
+        assert backfill.run_backfill(date(2026, 3, 1), date(2026, 3, 10), fetch=fetch, **run) == 0
+        assert calls == []
+
+    store = HistoryStore(db)
+    try:
+        dates = sorted(r["article_date"] for r in store.query(limit=10))
+    finally:
+        store.close()
+    assert dates == ["2026-03-01", "2026-03-05", "2026-03-09"]
+    hosthealth.reset()
+    content.reset_profiles()
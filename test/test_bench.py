@@ -0,0 +1,15 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+from bench import run_scale
+
+def test_offline_pipeline_smoke():
+    # 네트워크 없이 stand-in 서버로 전체 단계가 돌아가는지 작은 규모로 확인
+    results = {r["stage"]: r for r in run_scale(20, 3, rows_per_comment=5, memory=False)}
+    assert set(results) == {"fetch_news", "build_regulations_from_news", "render_markdown", "apply_deduplication", "publish"}
+    assert results["fetch_news"]["items"] == 20
+    assert results["build_regulations_from_news"]["items"] == 20
+    # find/create issue, list comments, list open issues, create comment, slack post
+    assert results["publish"]["http_requests"] >= 5
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+from bs4 import BeautifulSoup
+from standins import FILLER, _fill, _read
+from src import content, metrics
+
+def _page(n: int) -> BeautifulSoup:
+    html = _fill(_read("article.html"), title=f"EU advances AI bill #{n}", source="Reuters",
+                 country_phrase="European Union", pub_date="2026-03-01", filler=FILLER)
+    return BeautifulSoup(html, "lxml")
+
+def test_main_text_drops_boilerplate_and_reuses_profile(tmp_path, monkeypatch):
+    path = tmp_path / "site_profiles.json"
+    monkeypatch.setenv("SITE_PROFILES", str(path))
+    content.reset_profiles()
+    metrics.reset()
+    try:
+        full = _page(1).get_text("\n")
+        text = content.extract_main_text(_page(1), "reuters.com")
+        assert "penalty of up to 7 percent" in text and "EU advances AI bill #1" in text
+        for junk in ("Privacy Policy", "Related coverage", "Newsletters", "We use cookies", "All rights reserved"):
+            assert junk in full and junk not in text
+        assert len(text) < len(full)
+        assert metrics.counter("site_profiles_learned") == 1
+
+        content.save_profiles()
+        assert json.loads(path.read_text())["reuters.com"]["selector"] == "#story"
+
+        # 다음 실행: 파일에서 프로필을 읽어 학습 없이 추출
+        content.reset_profiles()
+        assert content.extract_main_text(_page(2), "reuters.com").startswith("EU advances AI bill #2")
+        assert metrics.counter("site_profile_hits") == 1
+        assert metrics.counter("site_profiles_learned") == 1
+    finally:
+        content.reset_profiles()
+
+def test_layout_wrapper_classes_do_not_drop_article(monkeypatch):
+    monkeypatch.setenv("SITE_PROFILES", "")
+    content.reset_profiles()
+    body = "".join(f"<p>{FILLER} Paragraph {i} on the EU AI Act penalty regime.</p>" for i in range(3))
+    try:
+        for wrapper in ('<div class="layout has-sidebar">', '<div id="main-content" class="post commentary">'):
+            soup = BeautifulSoup(
+                f"<html><body>{wrapper}<article>{body}</article>"
+                '<div class="share-buttons">Share on X</div></div></body></html>',
+                "lxml",
+            )
+            text = content.extract_main_text(soup, f"example{len(wrapper)}.com")
+            assert "Paragraph 2 on the EU AI Act" in text and len(text) >= content.MIN_ROOT_CHARS
+            assert "Share on X" not in text
+    finally:
+        content.reset_profiles()
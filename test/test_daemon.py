@@ -0,0 +1,80 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+import pytest
+from standins import StandInServer
+from src import fetch, notify, run
+from src.daemon import adapt_interval, run_daemon
+from src.queries import NEWS_QUERIES
+
+def test_interval_backs_off_and_resets():
+    interval = 900.0
+    for _ in range(10):
+        interval = adapt_interval(interval, False, 300, 3600)
+    # 변화가 없으면 1.5배씩 늘어나 최대값에서 멈춤
+    assert interval == 3600
+    interval = adapt_interval(interval, True, 300, 3600)
+    assert interval == 1800
+    for _ in range(5):
+        interval = adapt_interval(interval, True, 300, 3600)
+    # 변화가 계속되면 최소값까지 줄어듦
+    assert interval == 300
+    assert adapt_interval(300, False, 300, 3600) == 450
+
+def test_run_daemon_publishes_only_new_items(tmp_path, monkeypatch):
+    with StandInServer(NEWS_QUERIES, 10) as server:
+        monkeypatch.setattr(fetch, "GOOGLE_NEWS_RSS", server.rss_template)
+        monkeypatch.setenv("GITHUB_API_URL", server.base_url)
+        monkeypatch.setenv("OUTBOX_DB", str(tmp_path / "outbox.db"))
+        monkeypatch.setenv("NOTIFY_ROUTES", str(tmp_path / "none.yml"))
+        for name in ("HOST_HEALTH_DB", "SITE_PROFILES", "HISTORY_DB"):
+            monkeypatch.setenv(name, "")
+        for name in ("DAEMON_MIN_INTERVAL", "DAEMON_MAX_INTERVAL", "DAEMON_INITIAL_INTERVAL"):
+            monkeypatch.delenv(name, raising=False)
+
+        now = [1000.0]
+        sleeps = []
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        settings = run.Settings(owner="o", repo="r", gh_token="t", slack_webhook=server.slack_url)
+        try:
+            run_daemon(settings, max_cycles=3, sleep=sleep, clock=lambda: now[0])
+        finally:
+            notify.shutdown()
+
+        # 1회차: 모든 피드가 새 항목 -> 게시, 주기 900 -> 450
+        # 2·3회차: 변화 없음 -> 게시 안 함, 주기 450 -> 675
+        assert sleeps == [450, 675]
+        assert len(server.issues) == 1 and len(server.comments[1]) == 1
+        assert "#9" in server.comments[1][0]["body"]
+        assert len(server.slack_messages) == 1
+
+def test_failed_publish_is_retried_on_next_poll(tmp_path, monkeypatch):
+    with StandInServer(NEWS_QUERIES, 5) as server:
+        monkeypatch.setattr(fetch, "GOOGLE_NEWS_RSS", server.rss_template)
+        for name in ("HOST_HEALTH_DB", "SITE_PROFILES", "HISTORY_DB"):
+            monkeypatch.setenv(name, "")
+        calls = []
+        def publish(settings, regulations):
+            calls.append(len(regulations))
+            if len(calls) == 1:
+                raise RuntimeError("GitHub 502")
+        monkeypatch.setattr(run, "publish", publish)
+
+        now = [1000.0]
+        def sleep(seconds):
+            now[0] += seconds
+
+        settings = run.Settings(owner="o", repo="r", gh_token="t", slack_webhook="")
+        run_daemon(settings, max_cycles=3, sleep=sleep, clock=lambda: now[0])
+        # 1회차 게시 실패 -> 2회차에 같은 항목을 다시 게시 -> 3회차에는 새 항목 없음
+        assert len(calls) == 2 and calls[0] == calls[1] > 0
+
+def test_daemon_rejects_dry_run():
+    with pytest.raises(SystemExit):
+        run.main(["--daemon", "--dry-run"])
@@ -0,0 +1,43 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+from standins import StandInServer
+from src import fetch, metrics
+from src.utils import canonical_url
+
+QUERIES = ["AI regulation", "AI 규제"]
+
+def _fetch_with(template: str, locales):
+    saved = fetch.GOOGLE_NEWS_RSS
+    fetch.GOOGLE_NEWS_RSS = template
+    fetch._FEED_CACHE.clear()
+    try:
+        return fetch.fetch_news(QUERIES, locales)
+    finally:
+        fetch.GOOGLE_NEWS_RSS = saved
+
+def test_canonical_url_ignores_edition_and_tracking_params():
+    a = "https://news.google.com/rss/articles/CBMi123?oc=5&hl=ko&gl=KR&ceid=KR:ko"
+    b = "https://NEWS.google.com/rss/articles/CBMi123?hl=en-US&gl=US&ceid=US:en&oc=5#x"
+    assert canonical_url(a) == canonical_url(b) == "https://news.google.com/rss/articles/CBMi123"
+    assert canonical_url("https://x.com/a/?utm_source=t&id=2&b=1") == "https://x.com/a?b=1&id=2"
+
+def test_locale_fanout_dedups_across_editions():
+    with StandInServer(QUERIES, 10) as server:
+        # 에디션마다 다른 피드 URL -> 피드는 쿼리 x 에디션만큼 요청, 기사는 고유한 것만
+        items = _fetch_with(server.rss_template + "&hl={hl}&gl={gl}", ["en-US", "ko-KR", "ja-JP"])
+        assert server.request_count == len(QUERIES) * 3
+        assert len(items) == 10
+        assert len({canonical_url(it.url) for it in items}) == 10
+
+def test_identical_feed_urls_are_coalesced():
+    metrics.reset()
+    with StandInServer(QUERIES, 10) as server:
+        # 템플릿에 에디션 자리표시자가 없으면 모든 에디션이 같은 URL -> 쿼리당 한 번만 요청
+        items = _fetch_with(server.rss_template, ["en-US", "ko-KR", "de-DE"])
+        assert server.request_count == len(QUERIES)
+        assert len(items) == 10
+    assert metrics.counter("feeds_coalesced") == len(QUERIES) * 2
@@ -0,0 +1,102 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.extract import RegulationInfo
+from src.history import HistoryStore
+
+def _reg(n: int, country: str = "EU", date: str = "2026-03-01") -> RegulationInfo:
+    return RegulationInfo(
+        update_or_filed_date=date,
+        country=country,
+        case_title="EU AI Act",
+        article_title=f"AI Act copyright penalty rules #{n}",
+        case_number="N/A",
+        reason="EU AI Act 관련 정보.",
+        article_urls=[f"https://news.google.com/rss/articles/CBMi{n}?oc=5", f"https://example.com/a/{n}?utm_source=x"],
+        matched_keywords="act",
+    )
+
+def test_record_is_idempotent_and_indexed(tmp_path):
+    store = HistoryStore(str(tmp_path / "h.db"))
+    assert len(store.record([_reg(1), _reg(2, "US", "2026-03-02")])) == 2
+    # 같은 기사가 다른 에디션 URL로 다시 들어와도 새 행을 만들지 않음
+    again = _reg(1)
+    again.article_urls = ["https://news.google.com/rss/articles/CBMi1?hl=ko&gl=KR&ceid=KR:ko"]
+    again.matched_keywords = "penalty"
+    assert store.record([again, _reg(3)]) == [_reg(3)]
+
+    rows = store.query(url="https://example.com/a/1")
+    assert len(rows) == 1 and rows[0]["canonical_url"] == "https://example.com/a/1"
+    assert rows[0]["keywords"] == "act, penalty"
+    assert rows[0]["score"] > 0
+    assert [r["article_title"] for r in store.query(country="US")] == ["AI Act copyright penalty rules #2"]
+    assert len(store.query(since="2026-03-02")) == 1
+    assert store.country_counts() == [("EU", 2), ("US", 1)]
+    plan = " ".join(r[3] for r in store.conn.execute("EXPLAIN QUERY PLAN SELECT * FROM regulations WHERE country = 'EU' AND article_date >= '2026-01-01'"))
+    assert "idx_regulations_country" in plan
+
+def test_trends_are_updated_incrementally(tmp_path):
+    from datetime import date
+    from src.history import trend_lines
+
+    path = str(tmp_path / "h.db")
+    store = HistoryStore(path)
+    store.record([_reg(1), _reg(2), _reg(3, "US", "2026-03-05"), _reg(4, "EU", "2026-02-27")])
+    store.record([_reg(1)])  # 이미 기록된 기사는 집계에 다시 더하지 않음
+    assert store.trends("month", ["2026-03"]) == 3
+    assert store.trends("month", ["2026-03"], country="EU", bands=("high",)) == 2
+    assert store.trends("day", ["2026-03-01", "2026-02-27"], country="EU") == 3
+    assert store.trend_breakdown("month", ["2026-03"]) == [("EU", 2, 2), ("US", 1, 1)]
+    assert store.trends("month", ["2026-03"], subjects=("ai act",)) == 3
+    assert store.trends("month", ["2026-03"], countries=("US",), subjects=("copyright",)) == 0
+    assert store.trend_breakdown("month", ["2026-03"], bands=("low",)) == []
+
+    # 추세 테이블이 없던 DB는 열 때 기존 기록으로 다시 채움
+    store.conn.execute("DELETE FROM trends")
+    store.close()
+    store = HistoryStore(path)
+    assert store.trends("month", ["2026-02", "2026-03"]) == 4
+    store.close()
+
+    lines = trend_lines(path, today=date(2026, 3, 6))
+    assert lines[0] == "📈 *Trend (2026-03)*"
+    assert lines[1] == "└ EU: 2 (🔥 2) / US: 1 (🔥 1)"
+    assert lines[2] == "└ 최근 7일: 3 items (🔥 3)"
+
+def test_dedup_uses_posted_url_index_instead_of_comments(tmp_path, monkeypatch):
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+    from standins import StandInServer
+    from src import notify, run
+
+    with StandInServer(["q"], 0) as server:
+        monkeypatch.setenv("GITHUB_API_URL", server.base_url)
+        monkeypatch.setenv("HISTORY_DB", str(tmp_path / "history.db"))
+        monkeypatch.setenv("OUTBOX_DB", str(tmp_path / "outbox.db"))
+        monkeypatch.setenv("NOTIFY_ROUTES", str(tmp_path / "none.yml"))
+        settings = run.Settings(owner="o", repo="r", gh_token="t", slack_webhook="")
+        regs = [_reg(n) for n in range(30)]
+        try:
+            # 첫 게시: 색인이 비어 있으므로 댓글 목록을 읽음
+            run.publish(settings, regs)
+            first = server.request_count
+            assert first == 5
+
+            # 같은 항목 재게시: 이슈 조회/이전 이슈 정리/댓글 작성만 (댓글 목록을 읽지 않음)
+            run.publish(settings, regs)
+            assert server.request_count - first == 3
+        finally:
+            notify.shutdown()
+        body = server.comments[1][-1]["body"]
+        assert "30 (Dup)" in body and "새로운 규제 소식이 0건입니다." in body
+
+def test_comment_baseline_compares_canonical_urls():
+    from src.dedup import apply_deduplication
+    from src.render import render_markdown
+
+    current = render_markdown([_reg(1), _reg(2)])
+    previous = render_markdown([_reg(1)]).replace("?oc=5", "?utm_source=feed&oc=5")
+    md, stats = apply_deduplication(current, [{"body": previous}])
+    # 댓글 경로도 색인 경로와 같이 정규화 URL로 비교 (추적 파라미터가 달라도 같은 기사)
+    assert stats["dup_news"] == 1 and stats["new_news"] == 1
@@ -0,0 +1,55 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import extract, hosthealth
+from src.fetch import NewsItem
+from src.hosthealth import HostHealth
+
+def test_circuit_opens_probes_and_persists(tmp_path):
+    clock = [1000.0]
+    path = str(tmp_path / "hosts.db")
+    h = HostHealth(path, failure_threshold=3, cooldown=600, clock=lambda: clock[0])
+    assert h.timeout("fast.example") == 15  # 처음 보는 호스트는 최대값
+    for _ in range(5):
+        h.record("fast.example", 0.2, ok=True)
+    assert h.timeout("fast.example") == 3  # 최소값으로 수렴
+    for _ in range(3):
+        assert h.allow("dead.example")
+        h.record("dead.example", 15, ok=False)
+    assert not h.allow("dead.example")
+    h.save()
+
+    # 다음 실행에서도 회로가 열린 상태 유지, cooldown 뒤에는 시험 요청 하나만 허용
+    clock[0] += 601
+    h2 = HostHealth(path, failure_threshold=3, cooldown=600, clock=lambda: clock[0])
+    assert h2.allow("dead.example")
+    assert not h2.allow("dead.example")
+    h2.record("dead.example", 15, ok=False)  # 시험 실패 -> 다시 열림
+    assert not h2.allow("dead.example")
+    clock[0] += 601
+    assert h2.allow("dead.example")
+    h2.record("dead.example", 1.0, ok=True)
+    assert h2.allow("dead.example") and h2.stats("dead.example").state == "closed"
+
+def test_open_circuit_falls_back_to_rss_text(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOST_HEALTH_DB", str(tmp_path / "hosts.db"))
+    monkeypatch.setenv("HOST_FAILURE_THRESHOLD", "1")
+    hosthealth.reset()
+    try:
+        item = NewsItem(
+            title="EU AI Act fines", url="http://127.0.0.1:9/articles/1", published_at=None, source="Dead News",
+            summary="Regulators propose penalties", source_url="https://dead.example",
+        )
+        text, _, fallback = extract.fetch_article_text(item)  # 연결 실패 -> 회로 열림, RSS로 대체
+        assert text == "EU AI Act fines\nRegulators propose penalties" and fallback
+        assert not hosthealth.get().allow("dead.example")
+        item.url = "http://127.0.0.1:9/articles/2"
+        assert extract.fetch_article_text(item)[0] == text
+        # RSS 대체 텍스트는 분석에는 쓰지만 본문 보관소로 보내지 않음
+        sunk = []
+        regs = extract.build_regulations_from_news([item], [], page_sink=lambda info, body: sunk.append(body))
+        assert regs and sunk == []
+    finally:
+        hosthealth.reset()
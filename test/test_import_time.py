@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# 시작 경로에서 로드되면 안 되는 무거운 의존성
+HEAVY_MODULES = ["requests", "yaml", "bs4", "lxml", "feedparser", "dateutil"]
+
+# `import src.run` 누적 import 시간 예산 (ms). 느린 CI에서는 IMPORT_BUDGET_MS로 조정
+IMPORT_BUDGET_MS = int(os.environ.get("IMPORT_BUDGET_MS", "150"))
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run([sys.executable, *args, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+def test_heavy_modules_not_loaded_on_import():
+    code = (
+        "import sys, src.run\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    loaded = _run(code).stdout.strip()
+    assert loaded == "", f"heavy modules imported at startup: {loaded}"
+
+def test_import_time_budget():
+    proc = _run("import src.run", "-X", "importtime")
+    # 형식: "import time: self [us] | cumulative | name"
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == "src.run":
+            cumulative_us = int(parts[1])
+    assert cumulative_us is not None, proc.stderr[-500:]
+    assert cumulative_us / 1000 <= IMPORT_BUDGET_MS, f"src.run import took {cumulative_us / 1000:.1f}ms (budget {IMPORT_BUDGET_MS}ms)"
+
+def test_check_config_skips_pipeline():
+    env = dict(os.environ, GITHUB_OWNER="o", GITHUB_REPO="r", GITHUB_TOKEN="t", SLACK_WEBHOOK_URL="http://localhost/x")
+    code = (
+        "import sys\n"
+        "from src.run import main\n"
+        "main(['--check-config'])\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    lines = proc.stdout.strip().splitlines()
+    assert lines[0].startswith("OK: o/r")
+    assert len(lines) == 1, f"heavy modules imported by --check-config: {lines[1:]}"
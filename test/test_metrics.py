@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import metrics, profiling
+
+def test_span_excludes_hook_time():
+    @contextmanager
+    def slow_hook(name):
+        time.sleep(0.05)
+        yield
+        time.sleep(0.05)
+
+    metrics.reset()
+    metrics.set_span_hook(slow_hook)
+    try:
+        with metrics.span("fast"):
+            pass
+    finally:
+        metrics.set_span_hook(None)
+    assert metrics.snapshot()["stages"]["fast"] < 0.02
+
+def test_profiler_snapshots_only_top_level(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROFILE_TRACEMALLOC", "1")
+    prof = profiling.enable(str(tmp_path))
+    try:
+        with metrics.span("total"):
+            with metrics.span("inner"):
+                data = [bytearray(1000) for _ in range(200)]
+            del data
+    finally:
+        path = profiling.finish()
+    assert not tracemalloc.is_tracing()
+    assert set(prof._allocations) == {"total"}
+    # 중첩 단계의 최대 메모리는 바깥 단계에도 반영
+    assert prof._peaks["total"] >= prof._peaks["inner"] >= 200_000
+    assert "top allocations" in open(path, encoding="utf-8").read()
+
+def test_prometheus_exposition_keeps_full_precision(tmp_path):
+    metrics.reset()
+    metrics.incr("feed_bytes", 12345678)
+    metrics.incr("ratio", 0.125)
+    metrics.observe("fetch", 0.1)
+    metrics.observe("fetch", 0.2)
+    text = metrics.render_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE ai_regulation_feed_bytes_total counter" in lines
+    assert "ai_regulation_feed_bytes_total 12345678" in lines
+    assert "ai_regulation_ratio_total 0.125" in lines
+    assert "ai_regulation_fetch_seconds_sum 0.3" in lines
+    assert "ai_regulation_fetch_seconds_count 2" in lines
+    assert "e+" not in text
+
+    json_path, prom_path = metrics.export(str(tmp_path))
+    assert os.path.basename(prom_path) == "ai_regulation.prom"
+    assert "ai_regulation_feed_bytes_total 12345678" in open(prom_path, encoding="utf-8").read()
+    assert '"feed_bytes": 12345678' in open(json_path, encoding="utf-8").read()
+    assert not list(tmp_path.glob("*.tmp"))
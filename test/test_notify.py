@@ -0,0 +1,123 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.extract import RegulationInfo
+from src.notify import Dispatcher, Route, route_message
+from src.slack import SlackRateLimited
+
+class FakeSlack:
+    def __init__(self):
+        self.sent = []
+        self.fail_with = None
+
+    def __call__(self, webhook, text):
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.sent.append((webhook, text))
+
+def _dispatcher(path, slack, clock):
+    return Dispatcher(path, coalesce_seconds=60, min_interval=0, sender=slack, clock=lambda: clock[0], sleep=lambda s: None)
+
+def test_burst_is_coalesced_and_rate_limit_defers(tmp_path):
+    clock, slack = [1000.0], FakeSlack()
+    d = _dispatcher(str(tmp_path / "o.db"), slack, clock)
+    d.submit("default", "https://hooks/a", "run 1")
+    clock[0] += 10
+    d.submit("default", "https://hooks/a", "run 2")
+    assert d.flush() == 0  # coalesce 시간 안에서는 대기
+    clock[0] += 55
+    slack.fail_with = SlackRateLimited(30)
+    assert d.flush() == 0
+    slack.fail_with = None
+    clock[0] += 10
+    assert d.flush(force=True) == 0  # Retry-After 동안은 강제 전송도 보류
+    clock[0] += 25
+    assert d.flush() == 2
+    assert slack.sent == [("https://hooks/a", "run 1\n\nrun 2")]
+    assert d.pending() == 0
+
+def test_failed_messages_survive_for_next_run(tmp_path):
+    clock, slack = [1000.0], FakeSlack()
+    path = str(tmp_path / "o.db")
+    d = _dispatcher(path, slack, clock)
+    d.submit("eu", "https://hooks/eu", "hello")
+    slack.fail_with = RuntimeError("503")
+    assert d.flush(force=True) == 0
+    assert d.close() == 1
+
+    # 다음 실행: 백오프가 지나면 새 디스패처가 재전송
+    slack.fail_with = None
+    clock[0] += 3600
+    d2 = _dispatcher(path, slack, clock)
+    assert d2.flush(force=True) == 0  # 이번 실행에 등록되지 않은 webhook은 보류
+    d2.register("https://hooks/eu")
+    assert d2.flush(force=True) == 1
+    assert slack.sent == [("https://hooks/eu", "hello")]
+
+def test_route_message_filters_by_country_and_score():
+    regs = [
+        RegulationInfo("2026-03-01", "EU", "EU AI Act", "AI Act penalty and fine", "N/A", "", ["https://e/1"]),
+        RegulationInfo("2026-03-01", "US", "AI policy", "Agency updates AI policy", "N/A", "", ["https://e/2"]),
+    ]
+    summary = ["🤖 *AI 규제/정책 모니터링*", "🕒 now", "", "📊 *Collection Status*"]
+    assert route_message(Route("default", "w"), summary, regs) == "\n".join(summary)
+    text = route_message(Route("eu", "w", countries=("EU",), min_score=60), summary, regs)
+    assert "🎯 *eu*: 1 items" in text and "AI Act penalty" in text and "Agency" not in text
+    assert route_message(Route("kr", "w", countries=("South Korea",)), summary, regs) is None
+
+def test_sent_rows_are_deleted_and_dead_rows_pruned(tmp_path):
+    clock, slack = [1000.0], FakeSlack()
+    d = Dispatcher(
+        str(tmp_path / "o.db"), coalesce_seconds=0, min_interval=0, max_attempts=1, dead_retention=86400,
+        sender=slack, clock=lambda: clock[0], sleep=lambda s: None,
+    )
+    d.submit("default", "https://hooks/a", "ok")
+    assert d.flush() == 1
+    assert d.count("sent") == 0 and d.count("pending") == 0
+
+    d.submit("default", "https://hooks/a", "broken")
+    slack.fail_with = RuntimeError("404")
+    assert d.flush() == 0
+    assert d.count("dead") == 1
+    clock[0] += 86400 + 1
+    d.flush()
+    assert d.count("dead") == 0
+
+def test_sending_thread_closes_its_connection(tmp_path):
+    slack = FakeSlack()
+    d = Dispatcher(str(tmp_path / "o.db"), coalesce_seconds=0, min_interval=0, sender=slack).start(poll_seconds=0.01)
+    d.submit("default", "https://hooks/a", "hi")
+    assert d.close(timeout=5) == 0
+    assert slack.sent == [("https://hooks/a", "hi")]
+    assert not d._thread.is_alive()
+    # 마지막 연결이 닫히면 SQLite가 WAL 파일을 정리합니다.
+    assert not (tmp_path / "o.db-wal").exists()
+
+def test_outbox_does_not_store_webhook_urls(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "o.db")
+    old = sqlite3.connect(path)
+    old.executescript(
+        "CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, route TEXT NOT NULL, webhook TEXT NOT NULL, "
+        "text TEXT NOT NULL, created_at REAL NOT NULL, next_attempt_at REAL NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, status TEXT NOT NULL DEFAULT 'pending', last_error TEXT);"
+        "INSERT INTO outbox(route, webhook, text, created_at, next_attempt_at) "
+        "VALUES ('eu', 'https://hooks/secret-old', 'left over', 1000, 1000);"
+    )
+    old.close()
+
+    clock, slack = [1000.0], FakeSlack()
+    d = _dispatcher(path, slack, clock)
+    d.submit("default", "https://hooks/secret-new", "hello")
+    data = b"".join(f.read_bytes() for f in tmp_path.iterdir())
+    assert b"secret-old" not in data and b"secret-new" not in data
+
+    # 이번 실행에 등록된 webhook만 전송하고, 이전 실행의 메시지는 그 라우트가 등록되면 전송
+    assert d.close() == 1
+    assert slack.sent == [("https://hooks/secret-new", "hello")]
+    d.register("https://hooks/secret-old")
+    assert d.flush(force=True) == 1
+    assert slack.sent[-1] == ("https://hooks/secret-old", "left over")
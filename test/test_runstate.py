@@ -0,0 +1,27 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import runstate
+from src.fetch import NewsItem
+
+def _item(url: str, hour: int) -> NewsItem:
+    return NewsItem(title="t", url=url, published_at=datetime(2026, 3, 1, hour, tzinfo=timezone.utc), source="")
+
+def test_fingerprint_ignores_order_and_edition_params():
+    a = [_item("https://news.google.com/rss/articles/A?oc=5&hl=ko", 1), _item("https://x.com/b", 2)]
+    b = [_item("https://x.com/b", 2), _item("https://news.google.com/rss/articles/A?hl=en-US", 1)]
+    assert runstate.fingerprint(a) == runstate.fingerprint(b)
+    assert runstate.fingerprint(a) != runstate.fingerprint(a + [_item("https://x.com/c", 3)])
+    assert runstate.fingerprint(a) != runstate.fingerprint([a[0], _item("https://x.com/b", 4)])
+
+def test_unchanged_until_heartbeat(tmp_path):
+    path = str(tmp_path / "state.json")
+    assert runstate.load(path) == {}
+    runstate.save(path, "abc", now=1000)
+    state = runstate.load(path)
+    assert runstate.unchanged(state, "abc", heartbeat_seconds=3600, now=2000)
+    assert not runstate.unchanged(state, "abd", heartbeat_seconds=3600, now=2000)
+    assert not runstate.unchanged(state, "abc", heartbeat_seconds=3600, now=5000)
@@ -0,0 +1,43 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import hosthealth, scheduler
+from src.fetch import NewsItem
+
+NOW = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+
+def _item(title: str, url: str, hours_ago: float) -> NewsItem:
+    return NewsItem(title=title, url=url, published_at=NOW - timedelta(hours=hours_ago), source="", summary="")
+
+def test_prioritize_puts_carried_first_then_expected_value(monkeypatch):
+    monkeypatch.setenv("HOST_HEALTH_DB", "")
+    hosthealth.reset()
+    weak = _item("Startup raises funding for AI chips", "https://x.com/a", 1)
+    strong = _item("EU AI Act penalty rules for copyright", "https://x.com/b", 30)
+    fresh_strong = _item("EU AI Act penalty rules for copyright", "https://x.com/c", 1)
+    carried = _item("Old item", "https://x.com/d", 60)
+    dup = _item("Old item", "https://x.com/d?utm_source=rss", 60)
+    ordered = scheduler.prioritize([weak, strong, dup, fresh_strong], [carried], now=NOW)
+    assert [it.url for it in ordered] == ["https://x.com/d", "https://x.com/c", "https://x.com/b", "https://x.com/a"]
+    hosthealth.reset()
+
+def test_plan_stops_at_deadline_and_defers_rest(tmp_path):
+    t = [0.0]
+    deadline = scheduler.Deadline(100, clock=lambda: t[0])
+    assert deadline.reserve == 25
+    items = [_item(f"n{i}", f"https://x.com/{i}", i) for i in range(5)]
+    plan = scheduler.Plan(items, deadline)
+    done = []
+    for it in plan:
+        done.append(it.url)
+        t[0] += 30  # 기사 하나에 30초
+    assert len(done) == 3 and [it.title for it in plan.deferred] == ["n3", "n4"]
+
+    path = str(tmp_path / "deferred.json")
+    scheduler.save_deferred(path, plan.deferred)
+    assert scheduler.load_deferred(path) == plan.deferred
+    scheduler.save_deferred(path, [])
+    assert not os.path.exists(path) and scheduler.load_deferred(path) == []
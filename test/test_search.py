@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.extract import RegulationInfo
+from src.search import ArticleArchive
+
+def _reg(n: int, title: str, date: str) -> RegulationInfo:
+    return RegulationInfo(date, "EU", "EU AI Act", title, "N/A", "", [f"https://example.com/{n}?utm_medium=rss"])
+
+def test_archive_search_ranks_and_snippets(tmp_path):
+    archive = ArticleArchive(str(tmp_path / "h.db"), batch_size=2)
+    filler = "Lawmakers met again on Tuesday. " * 40
+    archive.add(_reg(1, "Commission fines chatbot maker", "2026-01-10"), filler + "The copyright penalty applies to training data. " + filler)
+    archive.add(_reg(2, "Copyright office guidance on AI training", "2026-02-10"), filler + "copyright " + filler)
+    archive.add(_reg(3, "Unrelated budget vote", "2026-03-10"), filler)
+    archive.add(_reg(1, "duplicate", "2026-03-11"), "copyright")  # 같은 URL은 한 번만 보관
+    archive.close()
+
+    archive = ArticleArchive(str(tmp_path / "h.db"))
+    hits = archive.search("copyright")
+    assert [h.canonical_url for h in hits] == ["https://example.com/2", "https://example.com/1"]
+    assert "**copyright**" in hits[1].snippet and hits[1].snippet.startswith("…")
+    assert [h.article_date for h in archive.search("copyright", since="2026-02-01")] == ["2026-02-10"]
+    # FTS5 문법 오류는 단어 검색으로 대체
+    assert len(archive.search('copyright "penalty')) == 1
+    assert archive.text("https://example.com/3").startswith("Lawmakers")
+    archive.close()
@@ -0,0 +1,32 @@
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+from standins import StandInServer, article_title
+from src import fetch, metrics
+from src.fetch import NewsItem
+from src.queries import NEWS_QUERIES
+from src.shard import run_sharded
+
+def test_sharded_run_merges_results_and_worker_metrics(tmp_path, monkeypatch):
+    with StandInServer(NEWS_QUERIES, 20) as server:
+        # 워커 프로세스(spawn)는 환경 변수로 stand-in 서버 주소를 받음
+        monkeypatch.setenv("NEWS_RSS_URL", server.rss_template)
+        monkeypatch.setattr(fetch, "GOOGLE_NEWS_RSS", server.rss_template)
+        for name in ("HOST_HEALTH_DB", "SITE_PROFILES", "HISTORY_DB"):
+            monkeypatch.setenv(name, "")
+        carried = NewsItem(
+            title=article_title(500), url=f"{server.base_url}/articles/500",
+            published_at=datetime.now(timezone.utc), source="Reuters",
+        )
+        metrics.reset()
+        regs = run_sharded(3, 2, str(tmp_path / "queue.db"), items=[carried])
+
+    assert len(regs) == 21
+    assert any(r.article_title == article_title(500) for r in regs)
+    # 워커 프로세스에서 센 카운터가 코디네이터 요약에 합산됨
+    assert metrics.counter("in_window") == 21
+    assert metrics.counter("tasks_done") == 21 + len({fetch.feed_url(q) for q in NEWS_QUERIES})
@@ -0,0 +1,112 @@
+import os
+import sys
+from dataclasses import replace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "bench"))
+
+import pytest
+from standins import StandInServer
+from src import notify, run, targets
+from src.extract import RegulationInfo
+
+def _reg(n: int, country: str) -> RegulationInfo:
+    return RegulationInfo(
+        update_or_filed_date="2026-03-01",
+        country=country,
+        case_title="AI Act",
+        article_title=f"{country} AI Act penalty rules #{n}",
+        case_number="N/A",
+        reason="AI 규제 관련 정보.",
+        article_urls=[f"https://example.com/a/{n}"],
+        matched_keywords="act",
+    )
+
+def test_targets_filter_and_publish_in_parallel(tmp_path, monkeypatch):
+    with StandInServer(["q"], 0) as server:
+        monkeypatch.setenv("GITHUB_API_URL", server.base_url)
+        monkeypatch.setenv("OUTBOX_DB", str(tmp_path / "outbox.db"))
+        monkeypatch.setenv("HISTORY_DB", "")
+        monkeypatch.setenv("EU_SLACK", server.slack_url)
+        path = tmp_path / "targets.yml"
+        path.write_text(
+            "- name: eu-team\n"
+            "  title: EU AI 규제\n"
+            "  label: eu-monitor\n"
+            "  slack_webhook_env: EU_SLACK\n"
+            "  countries: [EU]\n"
+            "- name: all\n"
+            "  title: 전체 AI 규제\n",
+            encoding="utf-8",
+        )
+        base = run.Settings(owner="o", repo="r", gh_token="t", slack_webhook=server.slack_url)
+        target_list = targets.load_targets(base, str(path))
+        assert [t.settings.issue_label for t in target_list] == ["eu-monitor", "ai-regulation-monitor"]
+        assert target_list[1].routes == []
+
+        regs = [_reg(1, "EU"), _reg(2, "미국"), _reg(3, "EU")]
+        assert targets.publish_targets(target_list, regs, run.publish) == []
+        notify.shutdown()
+
+        comments = {i["title"].split(" (")[0]: server.comments[i["number"]][-1]["body"] for i in server.issues}
+        assert "#1" in comments["EU AI 규제"] and "#2" not in comments["EU AI 규제"]
+        assert all(f"#{n}" in comments["전체 AI 규제"] for n in (1, 2, 3))
+        # Slack은 webhook을 지정한 대상만
+        assert len(server.slack_messages) == 1 and "2 items total" in server.slack_messages[0]
+
+def test_targets_reject_shared_issue(tmp_path):
+    path = tmp_path / "targets.yml"
+    path.write_text("- name: a\n- name: b\n", encoding="utf-8")
+    base = run.Settings(owner="o", repo="r", gh_token="t", slack_webhook="")
+    with pytest.raises(ValueError):
+        targets.load_targets(base, str(path))
+
+def test_target_slack_trend_covers_only_its_filter(tmp_path, monkeypatch):
+    from datetime import datetime, timezone
+    from src.history import HistoryStore
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    history_db = str(tmp_path / "history.db")
+    store = HistoryStore(history_db)
+    store.record([
+        RegulationInfo(today, "EU", "AI Act", "EU AI Act penalty #1", "N/A", "", ["https://example.com/h/1"]),
+        RegulationInfo(today, "미국", "AI policy", "US AI policy #2", "N/A", "", ["https://example.com/h/2"]),
+        RegulationInfo(today, "미국", "AI Act", "US AI Act penalty #3", "N/A", "", ["https://example.com/h/3"]),
+    ])
+    store.close()
+
+    with StandInServer(["q"], 0) as server:
+        monkeypatch.setenv("GITHUB_API_URL", server.base_url)
+        monkeypatch.setenv("OUTBOX_DB", str(tmp_path / "outbox.db"))
+        monkeypatch.setenv("HISTORY_DB", history_db)
+        path = tmp_path / "targets.yml"
+        path.write_text(
+            "- name: eu-team\n"
+            "  title: EU AI 규제\n"
+            f"  slack_webhook: {server.slack_url}?t=eu\n"
+            "  countries: [EU]\n"
+            "- name: all\n"
+            "  title: 전체 AI 규제\n"
+            f"  slack_webhook: {server.slack_url}?t=all\n",
+            encoding="utf-8",
+        )
+        base = run.Settings(owner="o", repo="r", gh_token="t", slack_webhook="")
+        target_list = targets.load_targets(base, str(path))
+        try:
+            assert targets.publish_targets(target_list, [_reg(1, "EU"), _reg(2, "미국")], run.publish) == []
+        finally:
+            notify.shutdown()
+
+        eu = next(m for m in server.slack_messages if "1 items total" in m)
+        everyone = next(m for m in server.slack_messages if "2 items total" in m)
+        assert "└ EU: 1" in eu and "미국" not in eu and "최근 7일: 1 items" in eu
+        assert "미국: 2" in everyone and "EU: 1" in everyone and "최근 7일: 3 items" in everyone
+
+        # 강도 조건 대상: 기록 전체에서 해당 강도 구간(60점 이상)만 집계 (정책 기사 #2 제외)
+        strict = targets.Target("strict", replace(base, slack_webhook=f"{server.slack_url}?t=strict", issue_label="strict"), min_score=60)
+        assert strict.trend_scope["bands"] == ("high", "elevated")
+        try:
+            assert targets.publish_targets([strict], [_reg(4, "EU")], run.publish) == []
+        finally:
+            notify.shutdown()
+        assert "└ EU: 1 / 미국: 1" in server.slack_messages[-1] and "최근 7일: 2 items" in server.slack_messages[-1]
@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.workqueue import WorkQueue
+
+def test_enqueue_is_idempotent(tmp_path):
+    q = WorkQueue(str(tmp_path / "q.db"))
+    assert q.enqueue("article", "https://a", {"n": 1})
+    assert not q.enqueue("article", "https://a", {"n": 2})
+    assert q.counts() == {"pending": 1}
+
+def test_expired_lease_is_reclaimed_and_result_written_once(tmp_path):
+    q = WorkQueue(str(tmp_path / "q.db"), lease_seconds=10, max_attempts=3)
+    q.enqueue("article", "https://a", {})
+    t1 = q.claim("w1", now=100)
+    assert t1 is not None
+    # lease 유지 중에는 다른 워커가 가져갈 수 없음
+    assert q.claim("w2", now=105) is None
+    # lease 만료 후 재할당
+    t2 = q.claim("w2", now=111)
+    assert t2 is not None and t2.attempts == 2
+    q.complete(t2, {"ok": 2})
+    q.complete(t1, {"ok": 1})  # 늦게 끝난 원래 워커도 같은 키로 덮어쓸 뿐
+    assert list(q.results("article")) == [{"ok": 1}]
+    assert q.unfinished() == 0
+
+def test_fail_retries_then_gives_up(tmp_path):
+    q = WorkQueue(str(tmp_path / "q.db"), max_attempts=2)
+    q.enqueue("query", "q1", {})
+    q.fail(q.claim("w1"), "boom")
+    assert q.counts() == {"pending": 1}
+    q.fail(q.claim("w1"), "boom")
+    assert q.counts() == {"failed": 1}
+    assert q.claim("w1") is None
+    assert q.unfinished() == 0
+
+def test_expired_lease_on_last_attempt_becomes_failed(tmp_path):
+    q = WorkQueue(str(tmp_path / "q.db"), lease_seconds=10, max_attempts=1)
+    q.enqueue("article", "https://a", {})
+    assert q.claim("w1", now=100) is not None
+    # 워커가 죽고 lease가 만료되면 더 시도할 수 없으므로 failed
+    assert q.claim("w2", now=111) is None
+    assert q.counts() == {"failed": 1}
+    assert q.failed()[0]["last_error"] == "lease expired"